@@ -51,6 +51,8 @@ class MemoryBridge:
     def __init__(self, supabase_client=None):  # type: ignore[no-untyped-def]
         self._supabase = supabase_client
         self._local_db = get_lessons_db()
+        # Cleared once match_lessons_quantized turns out to be missing (migration 005)
+        self._quantized_rpc = True
 
     @classmethod
     def get_instance(cls, supabase_client=None) -> "MemoryBridge":  # type: ignore[no-untyped-def]
@@ -356,12 +358,22 @@ class MemoryBridge:
             if query_embedding is None:
                 return []
 
-            result = self._supabase.client.rpc("match_lessons", {
+            params = {
                 "query_embedding": query_embedding,
                 "match_team_id": self._supabase.team_id,
                 "match_threshold": 0.15,
                 "match_count": limit,
-            }).execute()
+            }
+            result = None
+            if self._quantized_rpc:
+                try:
+                    result = self._supabase.client.rpc("match_lessons_quantized", params).execute()
+                except Exception as e:
+                    if "PGRST202" not in str(e):
+                        raise
+                    self._quantized_rpc = False
+            if result is None:
+                result = self._supabase.client.rpc("match_lessons", params).execute()
 
             lessons_with_scores: list[tuple[LessonLearned, float]] = []
             for row in result.data or []:
@@ -14,6 +14,7 @@ from agent.meta_learning.models import (
     get_lessons_db,
 )
 from agent.models.project import ProjectState, Phase
+from agent.supabase_client import TITLE_STRIP_CHARS, normalize_lesson_title
 
 
 def capture_project_outcome(project: ProjectState) -> ProjectOutcome:
@@ -531,14 +532,27 @@ def _sync_lessons_to_supabase(
                 pass  # Embedding is optional
 
             # Upsert: if lesson with same title+team exists, update it
-            # Otherwise insert new
-            existing = (
-                client.table("lessons_learned")
-                .select("id, frequency")
-                .eq("team_id", team_id)
-                .ilike("title", lesson.title)
-                .execute()
-            )
+            # Otherwise insert new. normalize_lesson_title compares titles
+            # the way the unique index on (team_id, title_norm) does.
+            try:
+                existing = (
+                    client.table("lessons_learned")
+                    .select("id, frequency")
+                    .eq("team_id", team_id)
+                    .eq("title_norm", normalize_lesson_title(lesson.title))
+                    .execute()
+                )
+            except Exception as e:
+                # 42703 = no title_norm column (007 migration not run yet)
+                if "42703" not in str(e):
+                    raise
+                existing = (
+                    client.table("lessons_learned")
+                    .select("id, frequency")
+                    .eq("team_id", team_id)
+                    .ilike("title", lesson.title.strip(TITLE_STRIP_CHARS))
+                    .execute()
+                )
 
             if existing.data:
                 # Update: increment frequency, update confidence
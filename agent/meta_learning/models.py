@@ -4,12 +4,14 @@ Meta-Learning Models
 Data models for capturing and storing lessons learned from projects.
 """
 
+from collections import Counter
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 from uuid import UUID, uuid4
 import json
+import threading
 
 from pydantic import BaseModel, Field
 
@@ -175,6 +177,9 @@ class LessonsDatabase:
         self.storage_path = storage_path
         self._lessons: dict[UUID, LessonLearned] = {}
         self._outcomes: dict[UUID, ProjectOutcome] = {}
+        # Bumped on every write so callers can key caches on it
+        self.revision = 0
+        self._stats_cache: tuple[int, dict[str, Any]] | None = None
 
         # Load from storage if available
         if storage_path and storage_path.exists():
@@ -353,6 +358,7 @@ class LessonsDatabase:
 
     def _save(self) -> None:
         """Save to storage."""
+        self.revision += 1
         if not self.storage_path:
             return
 
@@ -393,7 +399,14 @@ class LessonsDatabase:
                 print(f"[LessonsDB] Skipping unparseable outcome[{i}]: {e}")
 
     def get_stats(self) -> dict[str, Any]:
-        """Get database statistics with quality metrics."""
+        """Get database statistics with quality metrics.
+
+        The result is computed once per revision, so repeated reads between
+        writes don't rescan every lesson. Treat the returned dict as read-only.
+        """
+        if self._stats_cache and self._stats_cache[0] == self.revision:
+            return self._stats_cache[1]
+
         lessons = list(self._lessons.values())
         outcomes = list(self._outcomes.values())
         success_outcomes = [o for o in outcomes if o.outcome == OutcomeType.SUCCESS]
@@ -402,15 +415,15 @@ class LessonsDatabase:
         low_confidence = [l.title for l in lessons if l.confidence < 0.5]
 
         # Detect duplicates (same title, case-insensitive)
-        titles = [l.title.lower().strip() for l in lessons]
-        duplicates = [t for t in set(titles) if titles.count(t) > 1]
+        title_counts = Counter(l.title.lower().strip() for l in lessons)
+        duplicates = [t for t, count in title_counts.items() if count > 1]
 
         by_category: dict[str, int] = {}
         for l in lessons:
             cat = l.category.value if hasattr(l.category, "value") else str(l.category)
             by_category[cat] = by_category.get(cat, 0) + 1
 
-        return {
+        stats = {
             "total_lessons": len(lessons),
             "total_outcomes": len(outcomes),
             "success_rate": len(success_outcomes) / len(outcomes) if outcomes else 0,
@@ -424,18 +437,27 @@ class LessonsDatabase:
                 for l in sorted(lessons, key=lambda x: x.frequency, reverse=True)[:5]
             ],
         }
+        self._stats_cache = (self.revision, stats)
+        return stats
 
 
 # Global database instance
 _db: LessonsDatabase | None = None
+_db_lock = threading.Lock()
 
 
 def get_lessons_db(storage_path: Path | None = None) -> LessonsDatabase:
-    """Get or create the global lessons database."""
+    """Get or create the global lessons database.
+
+    The JSON file is read once; later calls return the same instance.
+    Creation is locked so tools running in worker threads never load it twice.
+    """
     global _db
     if _db is None:
-        if storage_path is None:
-            # Default storage path
-            storage_path = Path(__file__).parent.parent.parent / "data" / "lessons.json"
-        _db = LessonsDatabase(storage_path)
+        with _db_lock:
+            if _db is None:
+                if storage_path is None:
+                    # Default storage path
+                    storage_path = Path(__file__).parent.parent.parent / "data" / "lessons.json"
+                _db = LessonsDatabase(storage_path)
     return _db
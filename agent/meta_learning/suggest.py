@@ -4,15 +4,68 @@ Suggestion Module
 Provides recommendations based on lessons learned from previous projects.
 """
 
+import numpy as np
+
 from agent.meta_learning.models import (
     LessonLearned,
+    LessonsDatabase,
     PatternMatch,
     PatternCategory,
     OutcomeType,
+    ProjectOutcome,
     get_lessons_db,
 )
 
 
+class _OutcomeMatrix:
+    """Column-oriented view of project outcomes for vectorized scoring."""
+
+    def __init__(self, outcomes: list[ProjectOutcome]):
+        self.outcomes = outcomes
+        self.project_types = np.array([o.project_type for o in outcomes], dtype=object)
+        self.success = np.array([o.success_score for o in outcomes], dtype=np.float64)
+        self.tech_counts = np.array([len(o.tech_stack) for o in outcomes], dtype=np.float64)
+
+        # Multi-hot (outcome x technology) matrix over distinct tech values
+        self.vocab: dict[str, int] = {}
+        for outcome in outcomes:
+            for tech in outcome.tech_stack.values():
+                self.vocab.setdefault(tech, len(self.vocab))
+        self.tech = np.zeros((len(outcomes), len(self.vocab)), dtype=np.float64)
+        for row, outcome in enumerate(outcomes):
+            for tech in outcome.tech_stack.values():
+                self.tech[row, self.vocab[tech]] = 1.0
+
+
+_outcome_matrix_cache: tuple[int, int, _OutcomeMatrix] | None = None
+
+
+def _get_outcome_matrix(db: LessonsDatabase) -> _OutcomeMatrix:
+    """Return the outcome matrix for `db`, rebuilding it after any write."""
+    global _outcome_matrix_cache
+    if (
+        _outcome_matrix_cache is None
+        or _outcome_matrix_cache[0] != id(db)
+        or _outcome_matrix_cache[1] != db.revision
+    ):
+        _outcome_matrix_cache = (id(db), db.revision, _OutcomeMatrix(db.get_outcomes()))
+    return _outcome_matrix_cache[2]
+
+
+def _top_k(scores: np.ndarray, limit: int) -> np.ndarray:
+    """Indices of the `limit` highest scores, ties kept in original order."""
+    if limit <= 0:
+        return np.empty(0, dtype=np.intp)
+    if limit < len(scores):
+        # O(N) selection of the cutoff, then sort only the candidates
+        kth = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order][:limit]
+
+
 def find_similar_projects(
     project_type: str,
     tech_stack: list[str] | None = None,
@@ -30,50 +83,42 @@ def find_similar_projects(
         List of similar project summaries
     """
     db = get_lessons_db()
-    outcomes = db.get_outcomes(project_type=project_type)
+    matrix = _get_outcome_matrix(db)
 
-    if not outcomes:
+    type_match = matrix.project_types == project_type
+    rows = np.flatnonzero(type_match)
+    if not rows.size:
         # Try without project type filter
-        outcomes = db.get_outcomes()
-
-    # Score and sort by similarity
-    scored = []
-    for outcome in outcomes:
-        score = 0.0
-
-        # Project type match
-        if outcome.project_type == project_type:
-            score += 0.5
+        rows = np.arange(len(matrix.outcomes))
 
-        # Tech stack overlap
-        if tech_stack:
-            outcome_tech = list(outcome.tech_stack.values())
-            overlap = len(set(outcome_tech) & set(tech_stack))
-            if outcome_tech:
-                score += 0.3 * (overlap / len(outcome_tech))
+    # Score all candidates at once: type match + tech overlap + success bonus
+    scores = np.where(type_match[rows], 0.5, 0.0)
 
-        # Success bonus
-        score += 0.2 * outcome.success_score
+    if tech_stack:
+        columns = [matrix.vocab[t] for t in set(tech_stack) if t in matrix.vocab]
+        overlap = matrix.tech[np.ix_(rows, columns)].sum(axis=1)
+        counts = matrix.tech_counts[rows]
+        has_tech = counts > 0
+        scores[has_tech] += 0.3 * (overlap[has_tech] / counts[has_tech])
 
-        scored.append((outcome, score))
+    scores += 0.2 * matrix.success[rows]
 
-    # Sort by score
-    scored.sort(key=lambda x: x[1], reverse=True)
-
-    return [
-        {
+    similar = []
+    for i in _top_k(scores, limit):
+        o = matrix.outcomes[rows[i]]
+        similar.append({
             "project_id": o.project_id,
             "objective": o.objective,
             "project_type": o.project_type,
             "tech_stack": o.tech_stack,
             "outcome": o.outcome.value,
             "success_score": o.success_score,
-            "similarity": score,
+            "similarity": float(scores[i]),
             "what_worked": o.what_worked[:3],
             "what_didnt_work": o.what_didnt_work[:3],
-        }
-        for o, score in scored[:limit]
-    ]
+        })
+
+    return similar
 
 
 def get_recommendations(
@@ -12,7 +12,7 @@ context assembly, knowledge retrieval, and output validation.
 from __future__ import annotations
 
 from langgraph.graph import END, StateGraph
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from agent.models.project import (
     AutonomyMode,
@@ -63,6 +63,8 @@ class OrchestratorState(BaseModel):
     Extends ProjectState with orchestration-specific fields.
     """
 
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     # Core project state
     project: ProjectState
 
@@ -75,9 +77,6 @@ class OrchestratorState(BaseModel):
     # Phase-specific counters
     discovery_question_index: int = 0
 
-    class Config:
-        arbitrary_types_allowed = True
-
 
 # Discovery phase questions
 DISCOVERY_QUESTIONS = [
@@ -5,6 +5,8 @@ Specialized agent for searching and gathering information.
 Uses the playbook RAG to find relevant documentation and patterns.
 """
 
+import asyncio
+
 from agent.factory.base import BaseAgent, AgentContext, AgentResult, AgentRole
 from agent.tools.playbook_rag import search_keyword, search_by_topic, get_file_content
 
@@ -43,16 +45,21 @@ class ResearcherAgent(BaseAgent):
         sources = []
 
         try:
+            # Strategy 1 (keyword search) and Strategy 2 (topic search) are
+            # independent file scans, so run them concurrently off the event loop
+            topics_to_check = self._extract_topics(task)
+            keyword_results, *topic_results_list = await asyncio.gather(
+                asyncio.to_thread(search_keyword, task, max_results=5),
+                *(asyncio.to_thread(search_by_topic, topic) for topic in topics_to_check),
+            )
+
             # Strategy 1: Keyword search
-            keyword_results = search_keyword(task, max_results=5)
             for result in keyword_results:
                 gathered_info.append(f"**{result.title}** ({result.file})\n{result.snippet}")
                 sources.append(result.file)
 
             # Strategy 2: Topic search for common topics
-            topics_to_check = self._extract_topics(task)
-            for topic in topics_to_check:
-                topic_results = search_by_topic(topic)
+            for topic_results in topic_results_list:
                 for result in topic_results:
                     if result.file not in sources:
                         gathered_info.append(f"**{result.title}** ({result.file})\n{result.snippet}")
@@ -60,6 +67,7 @@ class ResearcherAgent(BaseAgent):
 
             # Compile output
             if gathered_info:
+                source_lines = "\n".join(f"- {s}" for s in sources[:5])
                 output = f"""## Research Results for: {task}
 
 Found {len(gathered_info)} relevant sources:
@@ -67,7 +75,7 @@ Found {len(gathered_info)} relevant sources:
 {"---".join(gathered_info[:5])}
 
 ### Sources
-{chr(10).join(f"- {s}" for s in sources[:5])}
+{source_lines}
 """
                 return AgentResult(
                     success=True,
@@ -3,6 +3,7 @@ Supabase client for AI Project Playbook.
 Handles all database operations for shared team knowledge.
 """
 
+import asyncio
 import os
 from typing import Optional, List, Dict, Any
 from datetime import datetime
@@ -24,6 +25,16 @@ except ImportError:
 
 from agent.models.project import ProjectState, Phase
 
+# Characters btrim() strips when computing lessons_learned.title_norm
+# (007_unique_lesson_title_per_team.sql); str.strip() with no argument
+# strips more, so it would not match the unique index
+TITLE_STRIP_CHARS = " \t\r\n"
+
+
+def normalize_lesson_title(title: str) -> str:
+    """Normalize a lesson title exactly like the title_norm column."""
+    return title.strip(TITLE_STRIP_CHARS).lower()
+
 
 class SupabaseClient:
     """Client for Supabase operations."""
@@ -61,7 +72,9 @@ class SupabaseClient:
         """Get team by name."""
         if not self.client:
             return None
-        result = self.client.table("teams").select("*").eq("name", team_name).execute()
+        # Run the blocking request off the event loop so callers can gather it
+        query = self.client.table("teams").select("*").eq("name", team_name)
+        result = await asyncio.to_thread(query.execute)
         return result.data[0] if result.data else None
 
     async def get_or_create_team(self, team_name: str = "Nivanta AI") -> str:
@@ -255,18 +268,43 @@ class SupabaseClient:
     async def list_team_projects(
         self,
         limit: int = 20,
-        include_completed: bool = True
+        include_completed: bool = True,
+        columns: Optional[tuple[str, ...]] = None,
+        after: Optional[tuple[str, str]] = None,
     ) -> List[Dict]:
-        """List all projects for the team."""
+        """List all projects for the team, newest first.
+
+        Args:
+            limit: Maximum number of projects to return
+            include_completed: If False, skip projects marked as completed
+            columns: Columns to fetch (default: all). Keeps the payload small for listings.
+            after: (created_at, id) of the last row from the previous page
+                (keyset pagination; include both columns in `columns`)
+        """
         if not self.client or not self.team_id:
             return []
 
-        query = self.client.table("projects").select("*").eq("team_id", self.team_id)
+        select = ", ".join(columns) if columns else "*"
+        query = self.client.table("projects").select(select).eq("team_id", self.team_id)
 
         if not include_completed:
             query = query.is_("completed_at", "null")
 
-        result = query.order("created_at", desc=True).limit(limit).execute()
+        if after:
+            # id breaks created_at ties, so rows sharing a timestamp across a
+            # page boundary are neither skipped nor repeated
+            created_at, row_id = after
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt."{row_id}")'
+            )
+
+        result = (
+            query.order("created_at", desc=True)
+            .order("id", desc=True)
+            .limit(limit)
+            .execute()
+        )
         return result.data or []
 
     async def complete_project(self, session_id: str) -> bool:
@@ -324,7 +362,14 @@ class SupabaseClient:
         contributed_by: Optional[str] = None,
         confidence: float = 0.5
     ) -> Optional[Dict]:
-        """Add a new lesson learned."""
+        """
+        Add a new lesson learned.
+
+        Titles are unique per team, ignoring case and surrounding whitespace
+        (007_unique_lesson_title_per_team.sql). If the team already has the
+        lesson, the existing row is returned with "already_exists": True
+        instead of raising the unique violation.
+        """
         if not self.client or not self.team_id:
             return None
 
@@ -352,7 +397,29 @@ class SupabaseClient:
         except Exception:
             pass  # Embedding is optional
 
-        result = self.client.table("lessons_learned").insert(data).execute()
+        try:
+            result = self.client.table("lessons_learned").insert(data).execute()
+        except Exception as e:
+            # 23505 = unique_violation on (team_id, title_norm)
+            if "23505" not in str(e):
+                raise
+            existing = await self.find_lesson_by_title(title)
+            return {**existing, "already_exists": True} if existing else None
+        return result.data[0] if result.data else None
+
+    async def find_lesson_by_title(self, title: str) -> Optional[Dict]:
+        """Find a team lesson by title, ignoring case and surrounding whitespace."""
+        if not self.client or not self.team_id:
+            return None
+
+        result = (
+            self.client.table("lessons_learned")
+            .select("id, category, title, contributed_by, created_at")
+            .eq("team_id", self.team_id)
+            .eq("title_norm", normalize_lesson_title(title))
+            .limit(1)
+            .execute()
+        )
         return result.data[0] if result.data else None
 
     async def get_lessons(
@@ -360,12 +427,33 @@ class SupabaseClient:
         category: Optional[str] = None,
         project_type: Optional[str] = None,
         tech_stack: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        query_embedding: Optional[List[float]] = None
     ) -> List[Dict]:
-        """Get lessons with optional filtering."""
+        """Get lessons with optional filtering.
+
+        With a query_embedding, lessons are ranked by semantic similarity in
+        Postgres (select_lessons_by_similarity, migration 006) instead of by
+        confidence. Falls back to the confidence ordering if the RPC is missing.
+        """
         if not self.client or not self.team_id:
             return []
 
+        if query_embedding:
+            try:
+                result = self.client.rpc("select_lessons_by_similarity", {
+                    "query_embedding": query_embedding,
+                    "match_team_id": self.team_id,
+                    "match_count": limit,
+                    "filter_category": category,
+                    "filter_project_type": project_type,
+                    "filter_tech_stacks": tech_stack or None,
+                }).execute()
+                return result.data or []
+            except Exception as e:
+                if "PGRST202" not in str(e):
+                    print(f"Warning: Similarity query failed: {e}")
+
         query = self.client.table("lessons_learned").select("*").eq("team_id", self.team_id)
 
         if category:
@@ -386,7 +474,8 @@ class SupabaseClient:
         if not self.client or not self.team_id:
             return {"total": 0, "by_category": {}}
 
-        result = self.client.table("lessons_learned").select("category").eq("team_id", self.team_id).execute()
+        query = self.client.table("lessons_learned").select("category").eq("team_id", self.team_id)
+        result = await asyncio.to_thread(query.execute)
 
         lessons = result.data or []
         by_category = {}
@@ -243,6 +243,7 @@ def _analyze_features(project: ProjectState) -> dict:
         score = project.validation_results.get(score_key)
         score_str = f" (quality: {score:.0%})" if score is not None else ""
         lines.append(f"{icon} {i}. **{f.name}**{score_str} — {f.description[:60]}")
+    feature_lines = "\n".join(lines)
 
     report = f"""| Status | Count |
 |--------|-------|
@@ -253,7 +254,7 @@ def _analyze_features(project: ProjectState) -> dict:
 
 ### Feature List
 
-{chr(10).join(lines)}
+{feature_lines}
 """
 
     return {
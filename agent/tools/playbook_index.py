@@ -0,0 +1,222 @@
+"""
+Playbook Index Format
+
+Binary on-disk format for the playbook RAG index built by
+scripts/index_playbook.py.
+
+Layout (all integers little-endian):
+
+    header:  b"PBIX" magic, u16 format version
+    records: a sequence of tagged, length-prefixed records until EOF
+      F  file     path_len u32, path, title_len u32, title, size u64
+      K  keyword  kw_len u16, keyword
+      C  chunk    file_id u32, chunk_id u32, content_len u32, content,
+                  kw_count u16, then kw_id u32 per keyword
+
+Strings are UTF-8. File and keyword records are numbered in the order they
+appear, and chunks reference them by id, so a path or keyword is stored
+once for the whole index instead of once per chunk. A keyword record is
+written just before the first chunk that uses it. Because records carry no
+global counts, the index can be written incrementally as files are processed.
+
+The JSON index uses the same interning (see intern_index / expand_index).
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+MAGIC = b"PBIX"
+VERSION = 2
+
+_HEADER = struct.Struct("<4sH")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+_CHUNK_IDS = struct.Struct("<II")
+
+_FILE_TAG = b"F"
+_VOCAB_TAG = b"K"
+_CHUNK_TAG = b"C"
+
+
+class BinaryIndexWriter:
+    """Append file and chunk records to a binary index stream."""
+
+    def __init__(self, stream: BinaryIO):
+        self._stream = stream
+        self._file_ids: dict[str, int] = {}
+        self._vocab: dict[str, int] = {}
+        stream.write(_HEADER.pack(MAGIC, VERSION))
+
+    def add_file(self, path: str, title: str, size: int) -> int:
+        """Write a file record and return its file_id."""
+        file_id = len(self._file_ids)
+        self._file_ids[path] = file_id
+        path_bytes = path.encode("utf-8")
+        title_bytes = title.encode("utf-8")
+        self._stream.write(b"".join((
+            _FILE_TAG,
+            _U32.pack(len(path_bytes)), path_bytes,
+            _U32.pack(len(title_bytes)), title_bytes,
+            _U64.pack(size),
+        )))
+        return file_id
+
+    def add_chunk(self, path: str, chunk_id: int, content: str, keywords: list[str]) -> None:
+        """Write a chunk record for a file already added with add_file."""
+        parts = []
+        keyword_ids = []
+        for keyword in keywords:
+            keyword_id = self._vocab.get(keyword)
+            if keyword_id is None:
+                keyword_id = self._vocab[keyword] = len(self._vocab)
+                keyword_bytes = keyword.encode("utf-8")
+                parts.append(_VOCAB_TAG)
+                parts.append(_U16.pack(len(keyword_bytes)))
+                parts.append(keyword_bytes)
+            keyword_ids.append(keyword_id)
+
+        content_bytes = content.encode("utf-8")
+        parts.append(_CHUNK_TAG)
+        parts.append(_CHUNK_IDS.pack(self._file_ids[path], chunk_id))
+        parts.append(_U32.pack(len(content_bytes)))
+        parts.append(content_bytes)
+        parts.append(_U16.pack(len(keyword_ids)))
+        parts.append(struct.pack(f"<{len(keyword_ids)}I", *keyword_ids))
+        self._stream.write(b"".join(parts))
+
+
+def serialize_binary(index: dict, path: Path) -> None:
+    """Write an index dict ({"files": [...], "chunks": [...]}) in binary form."""
+    with open(path, "wb") as f:
+        writer = BinaryIndexWriter(f)
+        for file_info in index["files"]:
+            writer.add_file(file_info["path"], file_info["title"], file_info["size"])
+        for chunk in index["chunks"]:
+            writer.add_chunk(chunk["file"], chunk["chunk_id"], chunk["content"], chunk["keywords"])
+
+
+def load_binary(path: Path) -> dict:
+    """
+    Read a binary index back into the same dict shape the JSON index uses.
+
+    Raises:
+        ValueError: If the file is not a binary playbook index, or is
+            truncated or corrupt
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        try:
+            return _parse(mm)
+        except (struct.error, IndexError) as e:
+            raise ValueError(f"Corrupt playbook index: {e}") from e
+
+
+def _parse(buf: mmap.mmap) -> dict:
+    # Reads the mmap directly: struct.unpack_from only borrows the buffer for
+    # the call, and slicing copies bytes out, so no view of the map outlives
+    # a parse error and the mmap can always be closed
+    magic, version = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a playbook index (bad magic or version)")
+
+    files: list[dict] = []
+    vocab: list[str] = []
+    chunks: list[dict] = []
+    offset = _HEADER.size
+    end = len(buf)
+
+    while offset < end:
+        tag = buf[offset]
+        offset += 1
+
+        if tag == _FILE_TAG[0]:
+            (length,) = _U32.unpack_from(buf, offset)
+            offset += 4
+            file_path = _read_str(buf, offset, length)
+            offset += length
+            (length,) = _U32.unpack_from(buf, offset)
+            offset += 4
+            title = _read_str(buf, offset, length)
+            offset += length
+            (size,) = _U64.unpack_from(buf, offset)
+            offset += 8
+            files.append({"path": file_path, "title": title, "size": size})
+
+        elif tag == _VOCAB_TAG[0]:
+            (length,) = _U16.unpack_from(buf, offset)
+            offset += 2
+            vocab.append(_read_str(buf, offset, length))
+            offset += length
+
+        elif tag == _CHUNK_TAG[0]:
+            file_id, chunk_id = _CHUNK_IDS.unpack_from(buf, offset)
+            offset += _CHUNK_IDS.size
+            (length,) = _U32.unpack_from(buf, offset)
+            offset += 4
+            content = _read_str(buf, offset, length)
+            offset += length
+            (count,) = _U16.unpack_from(buf, offset)
+            offset += 2
+            keyword_ids = struct.unpack_from(f"<{count}I", buf, offset)
+            offset += 4 * count
+            chunks.append({
+                "file": files[file_id]["path"],
+                "chunk_id": chunk_id,
+                "content": content,
+                "keywords": [vocab[i] for i in keyword_ids],
+            })
+
+        else:
+            raise ValueError(f"Corrupt playbook index: unknown record at byte {offset - 1}")
+
+    return {"files": files, "chunks": chunks}
+
+
+def _read_str(buf: mmap.mmap, offset: int, length: int) -> str:
+    """Decode a UTF-8 string field, rejecting one cut short by end of file."""
+    data = buf[offset:offset + length]
+    if len(data) != length:
+        raise ValueError(f"Corrupt playbook index: truncated string at byte {offset}")
+    return data.decode("utf-8")
+
+
+def intern_index(index: dict) -> dict:
+    """
+    Convert an index dict to its interned JSON form.
+
+    Chunks refer to their file by position in "files" ("file_id") and to
+    keywords by position in a shared "vocab" list ("kw").
+    """
+    file_ids = {file_info["path"]: i for i, file_info in enumerate(index["files"])}
+    vocab: dict[str, int] = {}
+    chunks = [
+        {
+            "file_id": file_ids[chunk["file"]],
+            "chunk_id": chunk["chunk_id"],
+            "content": chunk["content"],
+            "kw": [vocab.setdefault(keyword, len(vocab)) for keyword in chunk["keywords"]],
+        }
+        for chunk in index["chunks"]
+    ]
+    return {"files": index["files"], "vocab": list(vocab), "chunks": chunks}
+
+
+def expand_index(data: dict) -> dict:
+    """Inverse of intern_index; plain (non-interned) indexes are returned as-is."""
+    if "vocab" not in data:
+        return data
+
+    files = data["files"]
+    vocab = data["vocab"]
+    chunks = [
+        {
+            "file": files[chunk["file_id"]]["path"],
+            "chunk_id": chunk["chunk_id"],
+            "content": chunk["content"],
+            "keywords": [vocab[i] for i in chunk["kw"]],
+        }
+        for chunk in data["chunks"]
+    ]
+    return {"files": files, "chunks": chunks}
@@ -11,12 +11,19 @@ adapted to work without external embedding APIs.
 
 import json
 import re
-from pathlib import Path
 from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+from agent.tools.playbook_index import expand_index, load_binary
 
 PLAYBOOK_DIR = Path(__file__).parent.parent.parent / "playbook"
 INDEX_FILE = Path(__file__).parent.parent.parent / ".playbook_index.json"
+BINARY_INDEX_FILE = Path(__file__).parent.parent.parent / ".playbook_index.bin"
 
 
 @dataclass
@@ -123,10 +130,17 @@ QUERY_CATEGORIES = {
 
 
 def load_index() -> dict | None:
-    """Load the playbook index if it exists."""
+    """Load the playbook index if it exists (binary format first, then JSON)."""
+    if BINARY_INDEX_FILE.exists():
+        try:
+            return load_binary(BINARY_INDEX_FILE)
+        except Exception:
+            return None
     if INDEX_FILE.exists():
         try:
-            return json.loads(INDEX_FILE.read_text(encoding="utf-8"))
+            if orjson is not None:
+                return expand_index(orjson.loads(INDEX_FILE.read_bytes()))
+            return expand_index(json.loads(INDEX_FILE.read_text(encoding="utf-8")))
         except Exception:
             return None
     return None
@@ -10,12 +10,18 @@ Supports Supabase for shared team knowledge base.
 import asyncio
 import json
 import os
+import time
 from datetime import datetime
 from pathlib import Path
 
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from agent.orchestrator import (
     OrchestratorState,
     create_initial_state,
@@ -58,6 +64,7 @@ PLAYBOOK_DIR = Path(__file__).parent.parent / "playbook"
 supabase_url = os.getenv("SUPABASE_URL")
 supabase_key = os.getenv("SUPABASE_ANON_KEY")
 team_id = os.getenv("PLAYBOOK_TEAM_ID")
+playbook_user = os.getenv("PLAYBOOK_USER", "unknown")
 
 if supabase_url and supabase_key and team_id and team_id != "pending":
     db = configure_supabase(supabase_url, supabase_key, team_id)
@@ -66,10 +73,24 @@ else:
     SUPABASE_ENABLED = False
     db = None
 
+# Concurrency limits for agent runs and Supabase writes started by MCP tools
+_LLM_SEM = asyncio.Semaphore(int(os.getenv("PLAYBOOK_LLM_CONCURRENCY", "8")))
+_DB_SEM = asyncio.Semaphore(4)
+
 # In-memory session storage (fallback when Supabase not configured)
 # Stores OrchestratorState objects
 sessions: dict[str, OrchestratorState] = {}
 
+# Short-lived cache for team project listings (playbook_list_sessions)
+_TEAM_PROJECT_COLUMNS = ("session_id", "objective", "current_phase", "created_by", "repo_url", "created_at")
+_TEAM_PROJECTS_TTL = 5.0
+_team_projects_cache: tuple[float, list[dict]] | None = None
+
+# TTL cache for meta-learning suggestions, keyed on the normalized tool inputs
+_SUGGESTION_CACHE_TTL = 300.0
+_SUGGESTION_CACHE_MAXSIZE = 256
+_suggestion_cache: dict[tuple, tuple[float, object]] = {}
+
 # --- Archie's 4-Engine Architecture ---
 # Initialize engines at module load (Core Soul verification happens here)
 coordinator = EngineCoordinator()
@@ -130,6 +151,55 @@ def _initialize_engines_sync() -> None:
 _initialize_engines_sync()
 
 
+def _dumps_pretty(data: dict) -> str:
+    """Serialize data as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+async def _list_team_projects_cached() -> list[dict]:
+    """List open team projects from Supabase, reusing results for a few seconds."""
+    global _team_projects_cache
+    now = time.monotonic()
+    if _team_projects_cache and now - _team_projects_cache[0] < _TEAM_PROJECTS_TTL:
+        return _team_projects_cache[1]
+
+    projects = await db.list_team_projects(
+        limit=20,
+        include_completed=False,
+        columns=_TEAM_PROJECT_COLUMNS,
+    )
+    _team_projects_cache = (now, projects)
+    return projects
+
+
+def _invalidate_team_projects_cache() -> None:
+    """Drop the cached team project listing after a project row changes."""
+    global _team_projects_cache
+    _team_projects_cache = None
+
+
+def _cached_suggestion(key: tuple, compute):
+    """Return a cached meta-learning result for `key`, computing it on a miss.
+
+    The lessons database revision is part of the key, so any new lesson,
+    vote or outcome makes older entries unreachable.
+    """
+    key = (get_lessons_db().revision, *key)
+    now = time.monotonic()
+    hit = _suggestion_cache.get(key)
+    if hit and now - hit[0] < _SUGGESTION_CACHE_TTL:
+        return hit[1]
+
+    value = compute()
+    if len(_suggestion_cache) >= _SUGGESTION_CACHE_MAXSIZE:
+        # Dicts keep insertion order, so this evicts the oldest entry
+        _suggestion_cache.pop(next(iter(_suggestion_cache)))
+    _suggestion_cache[key] = (now, value)
+    return value
+
+
 async def _reconstruct_state_from_supabase(data: dict) -> OrchestratorState | None:
     """Reconstruct OrchestratorState from Supabase data."""
     from agent.models.project import (
@@ -206,6 +276,18 @@ async def _reconstruct_state_from_supabase(data: dict) -> OrchestratorState | No
         return None
 
 
+async def _load_session(session_id: str) -> OrchestratorState | None:
+    """Get a session from local memory, falling back to Supabase."""
+    state = sessions.get(session_id)
+    if state is None and SUPABASE_ENABLED and db:
+        remote_data = await db.load_orchestrator_state(session_id)
+        if remote_data:
+            state = await _reconstruct_state_from_supabase(remote_data)
+            if state:
+                sessions[session_id] = state
+    return state
+
+
 @mcp.tool(name="playbook_start_project")
 async def start_project(objective: str, mode: str = "supervised") -> str:
     """
@@ -233,7 +315,9 @@ async def start_project(objective: str, mode: str = "supervised") -> str:
 
     # Sync to Supabase if enabled (for team sharing)
     if SUPABASE_ENABLED and db:
-        await db.save_orchestrator_state(result)
+        async with _DB_SEM:
+            await db.save_orchestrator_state(result)
+        _invalidate_team_projects_cache()
 
     return f"""
 **Session Started: `{session_id}`**
@@ -263,22 +347,10 @@ async def answer_question(session_id: str, answer: str) -> str:
     await _ensure_engines_initialized()
 
     # Try local first, then Supabase
-    if session_id not in sessions:
-        # Try to load from Supabase
-        if SUPABASE_ENABLED and db:
-            remote_data = await db.load_orchestrator_state(session_id)
-            if remote_data:
-                # Reconstruct state from Supabase data
-                state = await _reconstruct_state_from_supabase(remote_data)
-                if state:
-                    sessions[session_id] = state
-
-    if session_id not in sessions:
+    state = await _load_session(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found. Use `playbook_list_sessions` to see available sessions."
 
-    # Get current state
-    state = sessions[session_id]
-
     # Update state with user input and run orchestrator
     state.user_input = answer
     state.project.needs_user_input = False
@@ -290,7 +362,8 @@ async def answer_question(session_id: str, answer: str) -> str:
 
     # Sync to Supabase
     if SUPABASE_ENABLED and db:
-        await db.save_orchestrator_state(result)
+        async with _DB_SEM:
+            await db.save_orchestrator_state(result)
 
     output = result.agent_output or "Processing..."
 
@@ -314,19 +387,10 @@ async def continue_project(session_id: str) -> str:
     await _ensure_engines_initialized()
 
     # Try local first, then Supabase
-    if session_id not in sessions:
-        # Try to load from Supabase
-        if SUPABASE_ENABLED and db:
-            remote_data = await db.load_orchestrator_state(session_id)
-            if remote_data:
-                state = await _reconstruct_state_from_supabase(remote_data)
-                if state:
-                    sessions[session_id] = state
-
-    if session_id not in sessions:
+    state = await _load_session(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found. Use `playbook_list_sessions` to see available sessions."
 
-    state = sessions[session_id]
     project = state.project
 
     # Build status summary
@@ -401,10 +465,10 @@ async def get_project_status(session_id: str) -> str:
     Returns:
         Detailed project status
     """
-    if session_id not in sessions:
+    state = sessions.get(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
-    state = sessions[session_id]
     project = state.project
 
     # Count feature progress
@@ -414,11 +478,11 @@ async def get_project_status(session_id: str) -> str:
 
     # Tech stack info
     ts = project.tech_stack
-    tech_info = json.dumps({
+    tech_info = _dumps_pretty({
         "frontend": ts.frontend,
         "backend": ts.backend,
         "database": ts.database,
-    }, indent=2) if ts.frontend or ts.backend or ts.database else "Not yet determined"
+    }) if ts.frontend or ts.backend or ts.database else "Not yet determined"
 
     status = f"""
 ## Project Status: {session_id}
@@ -474,7 +538,7 @@ async def list_sessions() -> str:
 
     # Show team sessions from Supabase
     if SUPABASE_ENABLED and db:
-        team_projects = await db.list_team_projects(limit=20, include_completed=False)
+        team_projects = await _list_team_projects_cached()
         if team_projects:
             output += "### Team Sessions (shared via Supabase)\n"
             for proj in team_projects:
@@ -507,10 +571,10 @@ async def get_claude_md(session_id: str) -> str:
     Returns:
         CLAUDE.md content or error message
     """
-    if session_id not in sessions:
+    state = sessions.get(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
-    state = sessions[session_id]
     if not state.project.claude_md:
         return "CLAUDE.md has not been generated yet. Complete the Planning phase first."
 
@@ -544,10 +608,10 @@ async def get_prp(session_id: str, feature_name: str = "") -> str:
     Returns:
         PRP-formatted plan or error message
     """
-    if session_id not in sessions:
+    state = sessions.get(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
-    state = sessions[session_id]
     project = state.project
 
     from agent.prp_builder import PRPBuilder
@@ -623,10 +687,10 @@ async def get_prd(session_id: str) -> str:
     Returns:
         PRD content or error message
     """
-    if session_id not in sessions:
+    state = sessions.get(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
-    state = sessions[session_id]
     if not state.project.prd:
         return "PRD has not been generated yet. Complete the Planning phase first."
 
@@ -669,10 +733,10 @@ async def get_execution_package(session_id: str) -> str:
     Returns:
         Complete execution package in markdown format
     """
-    if session_id not in sessions:
+    state = sessions.get(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
-    state = sessions[session_id]
     project = state.project
 
     if not project.claude_md:
@@ -727,19 +791,10 @@ async def handoff_to_disk(
     Returns:
         Report of all files written, skipped, and failed
     """
-    if session_id not in sessions:
-        # Try to load from Supabase
-        if SUPABASE_ENABLED and db:
-            remote_data = await db.load_orchestrator_state(session_id)
-            if remote_data:
-                state = await _reconstruct_state_from_supabase(remote_data)
-                if state:
-                    sessions[session_id] = state
-
-    if session_id not in sessions:
+    state = await _load_session(session_id)
+    if state is None:
         return f"## Error\n\nSession `{session_id}` not found."
 
-    state = sessions[session_id]
     project = state.project
 
     from agent.handoff import HandoffWriter
@@ -780,12 +835,12 @@ async def system_review(session_id: str) -> str:
     Returns:
         Comprehensive system review report with confidence score (1-10)
     """
-    if session_id not in sessions:
+    state = sessions.get(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
     from agent.system_review import generate_system_review
 
-    state = sessions[session_id]
     return generate_system_review(state.project)
 
 
@@ -851,7 +906,8 @@ async def run_task(task: str) -> str:
     Returns:
         Result from the specialized agent
     """
-    result = await run_development_task(task)
+    async with _LLM_SEM:
+        result = await run_development_task(task)
 
     output = f"""## Task Result
 
@@ -887,7 +943,8 @@ async def run_pipeline(feature: str) -> str:
     Returns:
         Results from all pipeline stages
     """
-    result = await run_feature_pipeline(feature)
+    async with _LLM_SEM:
+        result = await run_feature_pipeline(feature)
 
     output = f"""## Pipeline Result: {feature}
 
@@ -940,7 +997,8 @@ async def code_review(code: str, code_type: str = "generic") -> str:
         }
     )
 
-    result = await parallel_reviewers.execute(context)
+    async with _LLM_SEM:
+        result = await parallel_reviewers.execute(context)
 
     output = f"""## Parallel Code Review
 
@@ -986,7 +1044,8 @@ async def supervised_task(task: str, max_iterations: int = 5) -> str:
     default_supervisor.max_iterations = max_iterations
 
     context = AgentContext(task=task)
-    result = await default_supervisor.execute(context)
+    async with _LLM_SEM:
+        result = await default_supervisor.execute(context)
 
     output = f"""## Supervised Task Result
 
@@ -1030,7 +1089,8 @@ async def research_topic(topic: str) -> str:
 
     researcher = ResearcherAgent()
     context = AgentContext(task=topic)
-    result = await researcher.execute(context)
+    async with _LLM_SEM:
+        result = await researcher.execute(context)
 
     output = f"""## Research: {topic}
 
@@ -1066,7 +1126,8 @@ async def plan_feature(feature: str) -> str:
 
     planner = PlannerAgent()
     context = AgentContext(task=feature)
-    result = await planner.execute(context)
+    async with _LLM_SEM:
+        result = await planner.execute(context)
 
     return result.output
 
@@ -1098,7 +1159,8 @@ async def generate_code(task: str, code_type: str = "generic") -> str:
         task=task,
         shared_state={"code_type": code_type}
     )
-    result = await coder.execute(context)
+    async with _LLM_SEM:
+        result = await coder.execute(context)
 
     return result.output
 
@@ -1132,7 +1194,8 @@ async def generate_tests(code: str, code_type: str = "generic") -> str:
             "code_type": code_type,
         }
     )
-    result = await tester.execute(context)
+    async with _LLM_SEM:
+        result = await tester.execute(context)
 
     return result.output
 
@@ -1161,23 +1224,16 @@ async def complete_project(session_id: str, user_rating: int = 4, notes: str = "
         Summary of captured lessons
     """
     # Try local first, then Supabase
-    if session_id not in sessions:
-        if SUPABASE_ENABLED and db:
-            remote_data = await db.load_orchestrator_state(session_id)
-            if remote_data:
-                state = await _reconstruct_state_from_supabase(remote_data)
-                if state:
-                    sessions[session_id] = state
-
-    if session_id not in sessions:
+    state = await _load_session(session_id)
+    if state is None:
         return f"Error: Session '{session_id}' not found."
 
-    state = sessions[session_id]
     project = state.project
 
     # Mark as completed in Supabase
     if SUPABASE_ENABLED and db:
         await db.complete_project(session_id)
+        _invalidate_team_projects_cache()
 
     # Capture outcome
     outcome = capture_project_outcome(project)
@@ -1189,7 +1245,7 @@ async def complete_project(session_id: str, user_rating: int = 4, notes: str = "
     lessons_db = get_lessons_db()
     lessons_db.add_outcome(outcome)
 
-    output = f"""## Project Completed: {session_id}
+    parts: list[str] = [f"""## Project Completed: {session_id}
 
 ### Outcome Summary
 - **Result**: {outcome.outcome.value}
@@ -1198,29 +1254,29 @@ async def complete_project(session_id: str, user_rating: int = 4, notes: str = "
 - **Your Rating**: {"⭐" * user_rating}
 
 ### What Worked
-"""
+"""]
     for item in outcome.what_worked:
-        output += f"- ✅ {item}\n"
+        parts.append(f"- ✅ {item}\n")
 
-    output += "\n### What Didn't Work\n"
+    parts.append("\n### What Didn't Work\n")
     for item in outcome.what_didnt_work:
-        output += f"- ❌ {item}\n"
+        parts.append(f"- ❌ {item}\n")
 
     # Get stats
     stats = lessons_db.get_stats()
-    output += f"""
+    parts.append(f"""
 ### Meta-Learning Stats
 - **Total Lessons Captured**: {stats['total_lessons']}
 - **Projects Analyzed**: {stats['total_outcomes']}
 - **Overall Success Rate**: {stats['success_rate']:.0%}
 
 _Lessons from this project will improve recommendations for future projects._
-"""
+""")
 
     # Clean up local session
     del sessions[session_id]
 
-    return output
+    return "".join(parts)
 
 
 @mcp.tool(name="playbook_get_recommendations")
@@ -1242,10 +1298,13 @@ async def get_project_recommendations(
     """
     tech_list = [t.strip() for t in tech_stack.split(",") if t.strip()] if tech_stack else []
 
-    recommendations = get_recommendations(
-        project_type=project_type,
-        tech_stack=tech_list,
-        current_phase=phase if phase else None,
+    recommendations = _cached_suggestion(
+        ("recommendations", project_type, tuple(sorted(tech_list)), phase),
+        lambda: get_recommendations(
+            project_type=project_type,
+            tech_stack=tech_list,
+            current_phase=phase if phase else None,
+        ),
     )
 
     output = f"""## Recommendations for {project_type.title()} Project
@@ -1285,10 +1344,13 @@ async def find_similar(
     """
     tech_list = [t.strip() for t in tech_stack.split(",") if t.strip()] if tech_stack else []
 
-    similar = find_similar_projects(
-        project_type=project_type,
-        tech_stack=tech_list,
-        limit=limit,
+    similar = _cached_suggestion(
+        ("similar", project_type, tuple(sorted(tech_list)), limit),
+        lambda: find_similar_projects(
+            project_type=project_type,
+            tech_stack=tech_list,
+            limit=limit,
+        ),
     )
 
     if not similar:
@@ -1299,14 +1361,14 @@ No past projects match your criteria. This will be the first {project_type} proj
 As you complete projects, the system will learn patterns and provide better recommendations.
 """
 
-    output = f"""## Similar Past Projects
+    parts: list[str] = [f"""## Similar Past Projects
 
 Found {len(similar)} similar projects:
 
-"""
+"""]
     for i, proj in enumerate(similar, 1):
         stars = "⭐" * int(proj["success_score"] * 5)
-        output += f"""### {i}. {proj['objective'][:50]}...
+        parts.append(f"""### {i}. {proj['objective'][:50]}...
 
 - **Type**: {proj['project_type']}
 - **Tech Stack**: {', '.join(v for v in proj['tech_stack'].values() if v)}
@@ -1319,9 +1381,9 @@ Found {len(similar)} similar projects:
 
 ---
 
-"""
+""")
 
-    return output
+    return "".join(parts)
 
 
 @mcp.tool(name="playbook_suggest_stack")
@@ -1335,7 +1397,10 @@ async def suggest_stack(project_type: str) -> str:
     Returns:
         Recommended technologies for each layer
     """
-    suggestions = suggest_tech_stack(project_type)
+    suggestions = _cached_suggestion(
+        ("stack", project_type),
+        lambda: suggest_tech_stack(project_type),
+    )
 
     output = f"""## Suggested Tech Stack for {project_type.title()}
 
@@ -1367,6 +1432,21 @@ _Your specific requirements may warrant different choices._
     return output
 
 
+# Output template for playbook_learning_stats (str.format, filled in one call)
+_LEARNING_STATS_TEMPLATE = """## Meta-Learning Statistics
+
+### Overview
+- **Total Lessons Captured**: {total_lessons}
+- **Projects Analyzed**: {total_outcomes}
+- **Overall Success Rate**: {success_rate:.0%}
+
+### Lessons by Category
+{categories}{patterns}"""
+_LEARNING_STATS_NO_PATTERNS = "\n_No patterns captured yet. Complete some projects to start learning!_\n"
+# Rendered output, reused until the lessons database changes
+_learning_stats_cache: tuple[int, str] | None = None
+
+
 @mcp.tool(name="playbook_learning_stats")
 async def learning_stats() -> str:
     """
@@ -1375,29 +1455,34 @@ async def learning_stats() -> str:
     Returns:
         Summary of lessons learned and patterns captured
     """
+    global _learning_stats_cache
     db = get_lessons_db()
-    stats = db.get_stats()
-
-    output = f"""## Meta-Learning Statistics
-
-### Overview
-- **Total Lessons Captured**: {stats['total_lessons']}
-- **Projects Analyzed**: {stats['total_outcomes']}
-- **Overall Success Rate**: {stats['success_rate']:.0%}
+    if _learning_stats_cache and _learning_stats_cache[0] == db.revision:
+        return _learning_stats_cache[1]
 
-### Lessons by Category
-"""
-    for category, count in stats['lessons_by_category'].items():
-        if count > 0:
-            output += f"- **{category.replace('_', ' ').title()}**: {count} lessons\n"
+    stats = db.get_stats()
 
+    categories = "".join(
+        f"- **{category.replace('_', ' ').title()}**: {count} lessons\n"
+        for category, count in stats['by_category'].items()
+        if count > 0
+    )
     if stats['top_lessons']:
-        output += "\n### Most Common Patterns\n"
-        for lesson in stats['top_lessons']:
-            output += f"- {lesson['title']} (seen {lesson['frequency']}x)\n"
+        patterns = "\n### Most Common Patterns\n" + "".join(
+            f"- {lesson['title']} (seen {lesson['frequency']}x)\n"
+            for lesson in stats['top_lessons']
+        )
     else:
-        output += "\n_No patterns captured yet. Complete some projects to start learning!_\n"
-
+        patterns = _LEARNING_STATS_NO_PATTERNS
+
+    output = _LEARNING_STATS_TEMPLATE.format(
+        total_lessons=stats['total_lessons'],
+        total_outcomes=stats['total_outcomes'],
+        success_rate=stats['success_rate'],
+        categories=categories,
+        patterns=patterns,
+    )
+    _learning_stats_cache = (db.revision, output)
     return output
 
 
@@ -1465,18 +1550,10 @@ _This lesson will be used in future recommendations._
 # SUPABASE TOOLS (Team Shared Knowledge)
 # ============================================
 
-@mcp.tool(name="playbook_team_status")
-async def team_status() -> str:
-    """
-    Check Supabase connection and team configuration status.
+# Output templates for playbook_team_status
+_TEAM_STATUS_LOCAL = """## Team Configuration Status
 
-    Returns:
-        Connection status and team information
-    """
-    output = "## Team Configuration Status\n\n"
-
-    if not SUPABASE_ENABLED:
-        output += """### ❌ Supabase Not Configured
+### ❌ Supabase Not Configured
 
 The agent is running in **local mode**. Lessons and projects are stored locally
 and NOT shared with your team.
@@ -1497,30 +1574,49 @@ and NOT shared with your team.
 
 **Current Mode**: Local (JSON file storage)
 """
-    else:
-        # Try to get team info
-        team_info = await db.get_team()
-        lessons_stats = await db.get_lessons_stats()
+_TEAM_STATUS_CONNECTED_TEMPLATE = """## Team Configuration Status
 
-        output += f"""### ✅ Supabase Connected
+### ✅ Supabase Connected
 
-**Team**: {team_info['name'] if team_info else 'Unknown'}
-**Team ID**: {team_id[:8]}...
+**Team**: {team_name}
+**Team ID**: {team_id}...
 
 ### Shared Knowledge Base
-- **Total Lessons**: {lessons_stats['total']}
+- **Total Lessons**: {total}
 - **By Category**:
-"""
-        for cat, count in lessons_stats.get('by_category', {}).items():
-            output += f"  - {cat}: {count}\n"
-
-        output += """
+{categories}
 ---
 
 All lessons and project outcomes are shared with your team.
 """
 
-    return output
+
+@mcp.tool(name="playbook_team_status")
+async def team_status() -> str:
+    """
+    Check Supabase connection and team configuration status.
+
+    Returns:
+        Connection status and team information
+    """
+    if not SUPABASE_ENABLED:
+        return _TEAM_STATUS_LOCAL
+
+    # Team info and lesson stats are independent reads, fetch them together
+    team_info, lessons_stats = await asyncio.gather(
+        db.get_team(),
+        db.get_lessons_stats(),
+    )
+
+    return _TEAM_STATUS_CONNECTED_TEMPLATE.format(
+        team_name=team_info['name'] if team_info else 'Unknown',
+        team_id=team_id[:8],
+        total=lessons_stats['total'],
+        categories="".join(
+            f"  - {cat}: {count}\n"
+            for cat, count in lessons_stats.get('by_category', {}).items()
+        ),
+    )
 
 
 @mcp.tool(name="playbook_share_lesson")
@@ -1568,9 +1664,16 @@ Use `playbook_team_status` to see how to configure team sharing.
         project_types=project_types,
         tech_stacks=tech_list,
         tags=tag_list,
-        contributed_by=os.getenv("PLAYBOOK_USER", "unknown"),
+        contributed_by=playbook_user,
     )
 
+    if result and result.get("already_exists"):
+        return f"""## ℹ️ Lesson Already Shared
+
+**{result['title']}** is already in the team's lessons (shared by {result.get('contributed_by') or 'unknown'}).
+
+Nothing was added. Use `playbook_team_lessons` to see it.
+"""
     if result:
         return f"""## ✅ Lesson Shared with Team
 
@@ -1581,7 +1684,7 @@ Use `playbook_team_status` to see how to configure team sharing.
 - **Recommendation**: {recommendation}
 - **Technologies**: {', '.join(tech_list) if tech_list else 'Any'}
 - **Tags**: {', '.join(tag_list) if tag_list else 'None'}
-- **Contributed by**: {os.getenv("PLAYBOOK_USER", "unknown")}
+- **Contributed by**: {playbook_user}
 
 _This lesson is now available to all team members._
 """
@@ -1594,6 +1697,7 @@ async def team_lessons(
     category: str = "",
     project_type: str = "",
     limit: int = 10,
+    query: str = "",
 ) -> str:
     """
     Get lessons shared by the team.
@@ -1602,6 +1706,7 @@ async def team_lessons(
         category: Filter by category (optional)
         project_type: Filter by project type (optional)
         limit: Maximum lessons to return (default 10)
+        query: Rank lessons by semantic similarity to this text (optional)
 
     Returns:
         List of team lessons
@@ -1612,10 +1717,21 @@ async def team_lessons(
 Supabase is not configured. Use `playbook_team_status` to see how to configure.
 """
 
+    query_embedding = None
+    if query:
+        # Semantic ranking is best-effort; without an embedding backend the
+        # lessons come back ordered by confidence as before
+        try:
+            from agent.embedding import generate_query_embedding
+            query_embedding = await asyncio.to_thread(generate_query_embedding, query)
+        except Exception:
+            query_embedding = None
+
     lessons = await db.get_lessons(
         category=category if category else None,
         project_type=project_type if project_type else None,
         limit=limit,
+        query_embedding=query_embedding,
     )
 
     if not lessons:
@@ -1624,14 +1740,14 @@ Supabase is not configured. Use `playbook_team_status` to see how to configure.
 No lessons match your criteria. Be the first to share one with `playbook_share_lesson`!
 """
 
-    output = f"""## Team Lessons ({len(lessons)} found)
+    parts: list[str] = [f"""## Team Lessons ({len(lessons)} found)
 
-"""
+"""]
     for lesson in lessons:
         votes = lesson.get('upvotes', 0) - lesson.get('downvotes', 0)
         vote_str = f"+{votes}" if votes > 0 else str(votes)
 
-        output += f"""### {lesson['title']}
+        parts.append(f"""### {lesson['title']}
 
 - **Category**: {lesson['category']}
 - **Confidence**: {lesson['confidence']:.0%}
@@ -1644,9 +1760,9 @@ No lessons match your criteria. Be the first to share one with `playbook_share_l
 
 ---
 
-"""
+""")
 
-    return output
+    return "".join(parts)
 
 
 @mcp.tool(name="playbook_link_repo")
@@ -1710,6 +1826,8 @@ Expected formats:
 
     # Link the repo
     success = await db.link_repo(session_id, final_url)
+    if success:
+        _invalidate_team_projects_cache()
 
     if success:
         return f"""## ✅ Repository Linked
@@ -2,32 +2,51 @@
 Backfill embeddings for all existing Supabase lessons.
 
 Generates semantic embeddings and updates the lessons_learned table.
-Requires the 003_add_lesson_embeddings.sql migration to be run first.
+Requires the 003_add_lesson_embeddings.sql migration to be run first
+(004_add_missing_embedding_index.sql keeps the missing-embedding filter indexed).
 
 Usage:
     .venv/Scripts/python.exe scripts/backfill_embeddings.py [--dry-run]
 """
 
+import io
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from dotenv import load_dotenv
 
+# Rows per PostgREST upsert request
+UPSERT_BATCH_SIZE = 100
+# Rows per keyset-paginated SELECT (PostgREST caps unpaginated reads at max-rows)
+PAGE_SIZE = 500
+# Progress/report lines from the embedding pass are written once per this many rows
+FLUSH_EVERY = 100
+
+
+def _chunked(items: list[dict], size: int):
+    """Yield successive lists of at most `size` items."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _flush(buf: io.StringIO) -> None:
+    """Write buffered report lines to stdout and empty the buffer."""
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    buf.seek(0)
+    buf.truncate()
+
 
 def backfill(dry_run: bool = False) -> dict[str, int]:
     """Backfill embeddings for Supabase lessons that don't have one."""
     load_dotenv()
 
-    from agent.embedding import generate_lesson_embedding, is_available
-
-    if not is_available():
-        print("Error: No embedding backend available.")
-        print("Set OPENAI_API_KEY or VOYAGE_API_KEY, or ensure sentence-transformers works.")
-        return {"total": 0, "updated": 0, "skipped": 0, "failed": 0}
-
     from supabase import create_client
 
     supabase_url = os.getenv("SUPABASE_URL")
@@ -40,54 +59,122 @@ def backfill(dry_run: bool = False) -> dict[str, int]:
 
     client = create_client(supabase_url, supabase_key)
 
-    # Fetch all lessons (only those without embeddings)
-    result = (
+    # Count lessons that already have one (HEAD request, no rows transferred)
+    embedded = (
         client.table("lessons_learned")
-        .select("id, title, description, recommendation, embedding")
+        .select("id", count="exact", head=True)
         .eq("team_id", team_id)
+        .not_.is_("embedding", "null")
         .execute()
     )
+    skipped = embedded.count or 0
+
+    # Same for lessons still missing one; exit before loading any embedding
+    # backend (sentence-transformers can take seconds) when there is no work
+    missing = (
+        client.table("lessons_learned")
+        .select("id", count="exact", head=True)
+        .eq("team_id", team_id)
+        .is_("embedding", "null")
+        .execute()
+    )
+    if not missing.count:
+        print("Nothing to backfill: every lesson already has an embedding.")
+        return {"total": skipped, "updated": 0, "skipped": skipped, "failed": 0}
+
+    from agent.embedding import generate_lesson_embedding, is_available
+
+    if not is_available():
+        print("Error: No embedding backend available.")
+        print("Set OPENAI_API_KEY or VOYAGE_API_KEY, or ensure sentence-transformers works.")
+        return {"total": 0, "updated": 0, "skipped": 0, "failed": 0}
+
+    # Fetch only lessons without embeddings (filtered server-side), paging by id
+    to_embed: list[dict] = []
+    last_id = None
+    while True:
+        query = (
+            client.table("lessons_learned")
+            .select("id, team_id, category, title, description, recommendation")
+            .eq("team_id", team_id)
+            .is_("embedding", "null")
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(PAGE_SIZE).execute().data or []
+        to_embed.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+        last_id = page[-1]["id"]
 
-    lessons = result.data or []
     updated = 0
-    skipped = 0
     failed = 0
 
-    for row in lessons:
-        # Skip if already has embedding
-        if row.get("embedding"):
-            skipped += 1
-            continue
-
-        title = row.get("title", "")
-        description = row.get("description", "")
-        recommendation = row.get("recommendation", "")
-
-        embedding = generate_lesson_embedding(title, description, recommendation)
-        if embedding is None:
-            failed += 1
-            print(f"  FAILED: {title}")
-            continue
-
-        if dry_run:
-            print(f"  WOULD UPDATE: {title} ({len(embedding)} dims)")
-        else:
-            try:
-                client.table("lessons_learned").update(
-                    {"embedding": embedding}
-                ).eq("id", row["id"]).execute()
-                updated += 1
-                if updated % 10 == 0:
-                    print(f"  Progress: {updated} lessons updated...")
-            except Exception as e:
+    # Pass 1: generate embeddings in memory
+
+    def _embed(row: dict) -> tuple[dict, list[float] | None]:
+        return row, generate_lesson_embedding(
+            row.get("title", ""),
+            row.get("description", ""),
+            row.get("recommendation", ""),
+        )
+
+    # HTTP backends are latency-bound, so keep several requests in flight
+    max_workers = int(os.getenv("EMBED_CONCURRENCY", "16"))
+    pending: list[dict] = []
+    buf = io.StringIO()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_embed, row) for row in to_embed]
+        for done, future in enumerate(as_completed(futures), 1):
+            if done % 10 == 0:
+                buf.write(f"  Progress: {done}/{len(futures)} embeddings generated...\n")
+            if done % FLUSH_EVERY == 0:
+                _flush(buf)
+
+            row, embedding = future.result()
+            title = row.get("title", "")
+            if embedding is None:
                 failed += 1
-                print(f"  ERROR updating '{title}': {e}")
+                buf.write(f"  FAILED: {title}\n")
+                continue
 
-        if dry_run:
-            updated += 1
+            if dry_run:
+                buf.write(f"  WOULD UPDATE: {title} ({len(embedding)} dims)\n")
+                updated += 1
+                continue
+
+            # NOT NULL columns are included so the upsert's INSERT half is valid
+            pending.append({
+                "id": row["id"],
+                "team_id": row["team_id"],
+                "category": row["category"],
+                "title": title,
+                "description": row.get("description", ""),
+                "recommendation": row.get("recommendation", ""),
+                "embedding": embedding,
+            })
+    _flush(buf)
+
+    # Pass 2: write embeddings back in batches, one request per chunk
+    for batch in _chunked(pending, UPSERT_BATCH_SIZE):
+        try:
+            client.table("lessons_learned").upsert(batch, on_conflict="id").execute()
+            updated += len(batch)
+            print(f"  Progress: {updated} lessons updated...")
+        except Exception as e:
+            print(f"  Batch upsert failed ({e}), retrying {len(batch)} rows individually...")
+            for item in batch:
+                try:
+                    client.table("lessons_learned").update(
+                        {"embedding": item["embedding"]}
+                    ).eq("id", item["id"]).execute()
+                    updated += 1
+                except Exception as row_error:
+                    failed += 1
+                    print(f"  ERROR updating '{item['title']}': {row_error}")
 
     return {
-        "total": len(lessons),
+        "total": len(to_embed) + skipped,
         "updated": updated,
         "skipped": skipped,
         "failed": failed,
@@ -13,13 +13,25 @@ Flags:
     --supabase  Also update Supabase lessons (requires env vars)
 """
 
+import io
 import json
 import os
+import re
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rows per keyset-paginated SELECT in backfill_supabase
+PAGE_SIZE = 500
+# Dry-run report lines are buffered and written once per this many rows
+FLUSH_EVERY = 100
+
 # Canonical tech_stack values (from orchestrator DISCOVERY_QUESTIONS):
 #   Frontend: react-vite, nextjs, vue-nuxt, none
 #   Backend:  fastapi, express, django, serverless
@@ -29,6 +41,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 TECH_INFERENCE_MAP: dict[str, str] = {
     # Frontend — React ecosystem
     "react": "react-vite",
+    "reactjs": "react-vite",
     "shadcn": "react-vite",
     "react-hook-form": "react-vite",
     "vite": "react-vite",
@@ -38,6 +51,7 @@ TECH_INFERENCE_MAP: dict[str, str] = {
     "middleware de next": "nextjs",
     # Frontend — Vue
     "vue": "vue-nuxt",
+    "vuejs": "vue-nuxt",
     "nuxt": "vue-nuxt",
     # Backend — FastAPI / Python
     "fastapi": "fastapi",
@@ -47,6 +61,7 @@ TECH_INFERENCE_MAP: dict[str, str] = {
     # Backend — Express / Node
     "express": "express",
     "nodejs": "express",
+    "node.js": "express",
     # Backend — Django
     "django": "django",
     # Database — Supabase / PostgreSQL
@@ -58,12 +73,15 @@ TECH_INFERENCE_MAP: dict[str, str] = {
     # Database — MongoDB
     "mongodb": "mongodb",
     "mongo": "mongodb",
+    "mongoose": "mongodb",
     # Database — Firebase
     "firebase": "firebase",
     # Database — SQLite
     "sqlite": "sqlite",
+    "sqlite3": "sqlite",
     # Extras that imply a stack
     "tailwind": "react-vite",  # In our context, always used with React
+    "tailwindcss": "react-vite",
     "typescript": "react-vite",  # Most TS lessons are frontend React
 }
 
@@ -71,27 +89,56 @@ TECH_INFERENCE_MAP: dict[str, str] = {
 # (Next.js IS React, but the canonical value should be "nextjs")
 NEXTJS_INDICATORS = {"nextjs", "next.js", "middleware de next", "monorepo con next"}
 
+# Keywords are matched as whole tokens, so "reactor" no longer counts as
+# "react" and "urls" no longer counts as "rls". Hyphenated and dotted words
+# also contribute their parts ("react-vite" -> "react", "vite"). Spellings
+# that run words together ("tailwindcss", "reactjs") need their own entry
+# in TECH_INFERENCE_MAP.
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9.\-]*[a-z0-9]|[a-z0-9]")
+_PART_RE = re.compile(r"[a-z0-9]+")
+# Letter and digit runs, so a version suffix doesn't hide the name
+# ("vue3" -> "vue", "nextjs14" -> "nextjs", "postgres15" -> "postgres")
+_ALPHA_NUM_RE = re.compile(r"[a-z]+|[0-9]+")
+
+# Multi-word keywords can't be a single token; those keep a substring check
+_PHRASE_KEYWORDS = tuple(k for k in TECH_INFERENCE_MAP if not _TOKEN_RE.fullmatch(k))
+_TOKEN_KEYWORDS = frozenset(TECH_INFERENCE_MAP).difference(_PHRASE_KEYWORDS)
+
+# keyword → (canonical value, is a Next.js indicator), resolved once per hit
+_KEYWORD_TO_TECH: dict[str, tuple[str, bool]] = {
+    keyword: (tech, keyword in NEXTJS_INDICATORS)
+    for keyword, tech in TECH_INFERENCE_MAP.items()
+}
 
-def infer_tech_stacks(lesson: dict) -> list[str]:
-    """Analyze lesson fields to infer tech_stacks.
 
-    Returns a sorted list of canonical tech_stack values.
-    """
-    searchable = " ".join([
-        lesson.get("title", ""),
-        lesson.get("description", ""),
-        lesson.get("recommendation", ""),
-        " ".join(lesson.get("tags", [])),
+def searchable_text(lesson: dict) -> str:
+    """Build the lowercased text that tech keywords are matched against."""
+    return " ".join([
+        lesson.get("title") or "",
+        lesson.get("description") or "",
+        lesson.get("recommendation") or "",
+        " ".join(lesson.get("tags") or []),
     ]).lower()
 
+
+def infer_tech_stacks(searchable: str) -> list[str]:
+    """Infer tech_stacks from a lesson's searchable text (see searchable_text).
+
+    Returns a sorted list of canonical tech_stack values.
+    """
     inferred: set[str] = set()
     has_nextjs_indicator = False
 
-    for keyword, tech in TECH_INFERENCE_MAP.items():
-        if keyword in searchable:
-            inferred.add(tech)
-            if keyword in NEXTJS_INDICATORS:
-                has_nextjs_indicator = True
+    tokens = set(_TOKEN_RE.findall(searchable))
+    tokens.update(_PART_RE.findall(searchable))
+    tokens.update(_ALPHA_NUM_RE.findall(searchable))
+    hits = tokens & _TOKEN_KEYWORDS
+    hits.update(k for k in _PHRASE_KEYWORDS if k in searchable)
+
+    for keyword in hits:
+        tech, is_nextjs_indicator = _KEYWORD_TO_TECH[keyword]
+        inferred.add(tech)
+        has_nextjs_indicator |= is_nextjs_indicator
 
     # If both react-vite and nextjs matched, and there's a nextjs indicator,
     # remove react-vite (nextjs is more specific)
@@ -101,43 +148,64 @@ def infer_tech_stacks(lesson: dict) -> list[str]:
     return sorted(inferred)
 
 
+def _flush(buf: io.StringIO) -> None:
+    """Write buffered report lines to stdout and empty the buffer."""
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+    buf.seek(0)
+    buf.truncate()
+
+
 def backfill_local(dry_run: bool = False) -> dict[str, int]:
     """Backfill tech_stacks in data/lessons.json.
 
     Returns stats dict with counts.
     """
     lessons_file = Path(__file__).parent.parent / "data" / "lessons.json"
-    data = json.loads(lessons_file.read_text(encoding="utf-8"))
+    if orjson is not None:
+        data = orjson.loads(lessons_file.read_bytes())
+    else:
+        data = json.loads(lessons_file.read_text(encoding="utf-8"))
     lessons = data.get("lessons", [])
 
     updated = 0
     already_populated = 0
     no_match = 0
+    buf = io.StringIO()
+
+    for i, lesson in enumerate(lessons, 1):
+        if i % FLUSH_EVERY == 0:
+            _flush(buf)
 
-    for lesson in lessons:
         if lesson.get("tech_stacks"):
             already_populated += 1
             continue
 
-        inferred = infer_tech_stacks(lesson)
+        searchable = searchable_text(lesson)
+        inferred = infer_tech_stacks(searchable) if searchable.strip() else []
         if inferred:
             if dry_run:
-                print(f"  WOULD UPDATE: [{lesson.get('category')}] {lesson.get('title')}")
-                print(f"    -> tech_stacks: {inferred}")
+                buf.write(f"  WOULD UPDATE: [{lesson.get('category')}] {lesson.get('title')}\n")
+                buf.write(f"    -> tech_stacks: {inferred}\n")
             else:
                 lesson["tech_stacks"] = inferred
             updated += 1
         else:
             no_match += 1
             if dry_run:
-                print(f"  NO MATCH: [{lesson.get('category')}] {lesson.get('title')}")
-                print(f"    tags: {lesson.get('tags', [])}")
-
-    if not dry_run:
-        lessons_file.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+                buf.write(f"  NO MATCH: [{lesson.get('category')}] {lesson.get('title')}\n")
+                buf.write(f"    tags: {lesson.get('tags', [])}\n")
+    _flush(buf)
+
+    # Only rewrite the file when something actually changed
+    if not dry_run and updated:
+        if orjson is not None:
+            lessons_file.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            lessons_file.write_text(
+                json.dumps(data, indent=2, ensure_ascii=False),
+                encoding="utf-8",
+            )
 
     stats = {
         "total": len(lessons),
@@ -169,29 +237,42 @@ def backfill_supabase(dry_run: bool = False) -> dict[str, int]:
 
     client = create_client(supabase_url, supabase_key)
 
-    # Fetch all team lessons
-    result = (
-        client.table("lessons_learned")
-        .select("id, title, description, recommendation, tags, tech_stacks, category")
-        .eq("team_id", team_id)
-        .execute()
-    )
+    # Fetch all team lessons, paging by id so large teams aren't truncated
+    lessons: list[dict] = []
+    last_id = None
+    while True:
+        query = (
+            client.table("lessons_learned")
+            .select("id, title, description, recommendation, tags, tech_stacks, category")
+            .eq("team_id", team_id)
+        )
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        page = query.order("id").limit(PAGE_SIZE).execute().data or []
+        lessons.extend(page)
+        if len(page) < PAGE_SIZE:
+            break
+        last_id = page[-1]["id"]
 
-    lessons = result.data or []
     updated = 0
     already_populated = 0
     no_match = 0
+    buf = io.StringIO()
+
+    for i, row in enumerate(lessons, 1):
+        if i % FLUSH_EVERY == 0:
+            _flush(buf)
 
-    for row in lessons:
         if row.get("tech_stacks"):
             already_populated += 1
             continue
 
-        inferred = infer_tech_stacks(row)
+        searchable = searchable_text(row)
+        inferred = infer_tech_stacks(searchable) if searchable.strip() else []
         if inferred:
             if dry_run:
-                print(f"  WOULD UPDATE: [{row.get('category')}] {row.get('title')}")
-                print(f"    -> tech_stacks: {inferred}")
+                buf.write(f"  WOULD UPDATE: [{row.get('category')}] {row.get('title')}\n")
+                buf.write(f"    -> tech_stacks: {inferred}\n")
             else:
                 try:
                     client.table("lessons_learned").update(
@@ -199,10 +280,11 @@ def backfill_supabase(dry_run: bool = False) -> dict[str, int]:
                     ).eq("id", row["id"]).execute()
                     updated += 1
                 except Exception as e:
-                    print(f"  Error updating '{row.get('title')}': {e}")
+                    buf.write(f"  Error updating '{row.get('title')}': {e}\n")
             updated += 1 if dry_run else 0  # Count for dry_run display
         else:
             no_match += 1
+    _flush(buf)
 
     return {
         "total": len(lessons),
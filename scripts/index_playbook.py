@@ -6,7 +6,11 @@ This script reads all markdown files from the playbook directory,
 generates embeddings, and stores them for semantic search.
 
 Usage:
-    uv run python scripts/index_playbook.py
+    uv run python scripts/index_playbook.py [--format json [--pretty]] [--full]
+
+Files whose mtime and size are unchanged since the last run are not re-read;
+their records are copied from the previous index. Pass --full to rebuild
+everything.
 
 For Supabase storage (future):
     uv run python scripts/index_playbook.py --supabase
@@ -14,135 +18,413 @@ For Supabase storage (future):
 
 import argparse
 import json
+import os
+import re
+import struct
+import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 from rich.console import Console
 from rich.progress import track
 
+from agent.tools.playbook_index import (
+    BinaryIndexWriter,
+    expand_index,
+    intern_index,
+    load_binary,
+    serialize_binary,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 console = Console()
 
 PLAYBOOK_DIR = Path(__file__).parent.parent / "playbook"
 INDEX_FILE = Path(__file__).parent.parent / ".playbook_index.json"
+BINARY_INDEX_FILE = Path(__file__).parent.parent / ".playbook_index.bin"
+META_FILE = Path(__file__).parent.parent / ".playbook_index_meta.json"
+
+# Files to (re)process before a process pool is worth its startup cost
+PROCESS_POOL_MIN_FILES = 32
+
+# Bump when chunking or keyword extraction changes, so cached records from
+# older runs are rebuilt instead of reused
+INDEX_META_VERSION = 1
+
+# chunk_content break points, best first
+_BREAK_SEPARATORS = ("\n\n", "\n", " ")
+
+# Common words left out of chunk keywords
+_STOP_WORDS: frozenset[str] = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would", "could",
+    "should", "may", "might", "must", "shall", "can", "to", "of", "in",
+    "for", "on", "with", "at", "by", "from", "as", "into", "through",
+    "during", "before", "after", "above", "below", "between", "under",
+    "again", "further", "then", "once", "here", "there", "when", "where",
+    "why", "how", "all", "each", "few", "more", "most", "other", "some",
+    "such", "no", "nor", "not", "only", "own", "same", "so", "than",
+    "too", "very", "just", "and", "but", "if", "or", "because", "until",
+    "while", "this", "that", "these", "those", "it", "its",
+})
+
+# First "# " heading; only the head of the file is scanned for it
+_TITLE_RE = re.compile(r"^# +(.+)$", re.MULTILINE)
+_TITLE_SCAN_LIMIT = 4096
+
+# Entries kept per cache by extract_title / extract_keywords, which are
+# pure and may be called again on the same text within one process
+_EXTRACT_CACHE_SIZE = 4096
+
+# Whitespace-separated words, and the characters in them that
+# str.isalnum() rejects (\w also allows "_")
+_WORD_RE = re.compile(r"\S+")
+_PUNCT_RE = re.compile(r"[^\w\s]|_")
+
+
+def _walk_markdown(dirpath: str):
+    """Yield paths of markdown files under dirpath.
+
+    Uses os.scandir so file types come from the directory read itself;
+    no Path object or extra stat call is made for entries that aren't .md.
+    """
+    with os.scandir(dirpath) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_markdown(entry.path)
+            elif entry.name.endswith(".md") and entry.is_file():
+                yield entry.path
 
 
 def get_markdown_files() -> list[Path]:
     """Get all markdown files from the playbook directory."""
-    return list(PLAYBOOK_DIR.rglob("*.md"))
+    return [Path(p) for p in _walk_markdown(str(PLAYBOOK_DIR))]
 
 
-def chunk_content(content: str, chunk_size: int = 1000, overlap: int = 200) -> list[str]:
+def iter_chunks(content: str, chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
     """
-    Split content into overlapping chunks for better RAG retrieval.
+    Yield overlapping chunks of content for better RAG retrieval.
 
     Args:
         content: The full text content
         chunk_size: Maximum size of each chunk
         overlap: Overlap between chunks
 
-    Returns:
-        List of text chunks
+    Yields:
+        Non-empty, stripped text chunks
     """
-    chunks = []
+    # Works on str rather than UTF-8 bytes: every playbook file has non-ASCII
+    # text, and decoding each emitted chunk measured ~2x slower than slicing
+    # the str. chunk_size and overlap therefore count characters.
+    length = len(content)
     start = 0
 
-    while start < len(content):
+    while start < length:
         end = start + chunk_size
 
-        # Try to break at a newline or space
-        if end < len(content):
-            # Look for a good break point
-            break_point = content.rfind("\n\n", start, end)
-            if break_point == -1:
-                break_point = content.rfind("\n", start, end)
-            if break_point == -1:
-                break_point = content.rfind(" ", start, end)
+        # Try to break at a paragraph, then a newline, then a space
+        if end < length:
+            for separator in _BREAK_SEPARATORS:
+                if (break_point := content.rfind(separator, start, end)) != -1:
+                    break
             if break_point > start:
                 end = break_point
 
-        chunks.append(content[start:end].strip())
-        start = end - overlap
+        if chunk := content[start:end].strip():
+            yield chunk
+        if end >= length:
+            break
+
+        # Step back by the overlap, but always move forward: a break point
+        # within `overlap` of the chunk start used to send start backwards
+        start = end - overlap if end - overlap > start else end
+
+
+def chunk_content(content: str, chunk_size: int = 1000, overlap: int = 200) -> list[str]:
+    """Split content into overlapping chunks (list form of iter_chunks)."""
+    return list(iter_chunks(content, chunk_size, overlap))
+
 
-    return [c for c in chunks if c]  # Filter empty chunks
+def _process_file(file_path: Path) -> tuple[dict, list[dict]]:
+    """Read one markdown file and build its file entry and chunk records."""
+    # read_bytes skips the buffered text layer; newline translation is done
+    # by hand so CRLF checkouts (Windows autocrlf) index the same as LF
+    content = file_path.read_bytes().decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    relative_path = str(file_path.relative_to(PLAYBOOK_DIR))
 
+    file_info = {
+        "path": relative_path,
+        "title": extract_title(content),
+        "size": len(content),
+    }
 
-def create_simple_index() -> dict:
+    chunk_records = [
+        {
+            "file": relative_path,
+            "chunk_id": i,
+            "content": chunk,
+            "keywords": extract_keywords(chunk),
+        }
+        for i, chunk in enumerate(iter_chunks(content))
+    ]
+
+    return file_info, chunk_records
+
+
+def _file_stamp(file_path: Path) -> list[int]:
+    """Return [mtime_ns, size] used to detect an unchanged file."""
+    st = file_path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def load_previous_index() -> dict[str, tuple[list[int], dict, list[dict]]]:
     """
-    Create a simple keyword-based index (no embeddings).
+    Load the last run's records for incremental indexing.
 
     Returns:
-        Index dictionary with file paths and content chunks
+        Map of relative path -> (stamp, file_info, chunk_records); empty when
+        there is no usable previous index or metadata
     """
-    index = {"files": [], "chunks": []}
+    try:
+        meta = json.loads(META_FILE.read_text(encoding="utf-8"))
+        if meta.get("version") != INDEX_META_VERSION:
+            return {}
+        if BINARY_INDEX_FILE.exists():
+            index = load_binary(BINARY_INDEX_FILE)
+        elif INDEX_FILE.exists():
+            index = expand_index(json.loads(INDEX_FILE.read_bytes()))
+        else:
+            return {}
+
+        stamps = meta.get("files", {})
+        chunks_by_file: dict[str, list[dict]] = {}
+        for chunk in index["chunks"]:
+            chunks_by_file.setdefault(chunk["file"], []).append(chunk)
+
+        return {
+            file_info["path"]: (stamps[file_info["path"]], file_info, chunks_by_file.get(file_info["path"], []))
+            for file_info in index["files"]
+            if file_info["path"] in stamps
+        }
+    except (OSError, ValueError, struct.error, IndexError, KeyError, TypeError, AttributeError):
+        # Any unreadable or malformed index/metadata just means no cache
+        return {}
+
+
+def save_index_meta(stamps: dict[str, list[int]]) -> None:
+    """Write the mtime/size stamps of the files in the index just saved."""
+    META_FILE.write_text(
+        json.dumps({"version": INDEX_META_VERSION, "files": stamps}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+
+def iter_processed_files(
+    previous: dict[str, tuple[list[int], dict, list[dict]]] | None = None,
+    stamps: dict[str, list[int]] | None = None,
+):
+    """
+    Yield (file_info, chunk_records) for every playbook file, in file order.
 
+    Chunking and keyword extraction are CPU-bound, so with enough files to
+    process (PROCESS_POOL_MIN_FILES) and more than one CPU they run in a
+    process pool; otherwise a thread pool overlaps file I/O. Only a small
+    window of files is in flight at a time, so finished results never pile
+    up in memory while the consumer writes them out.
+
+    Args:
+        previous: Records from load_previous_index; files whose stamp still
+            matches are reused instead of being read again
+        stamps: If given, filled with the stamp of every file yielded
+    """
     md_files = get_markdown_files()
     console.print(f"[blue]Found {len(md_files)} markdown files[/blue]")
 
-    for file_path in track(md_files, description="Indexing files..."):
+    previous = previous or {}
+    stamped: list[tuple[Path, list[int], tuple[dict, list[dict]] | None]] = []
+    for file_path in md_files:
         try:
-            content = file_path.read_text(encoding="utf-8")
-            relative_path = str(file_path.relative_to(PLAYBOOK_DIR))
-
-            # Store file info
-            index["files"].append({
-                "path": relative_path,
-                "title": extract_title(content),
-                "size": len(content),
-            })
-
-            # Create chunks
-            chunks = chunk_content(content)
-            for i, chunk in enumerate(chunks):
-                index["chunks"].append({
-                    "file": relative_path,
-                    "chunk_id": i,
-                    "content": chunk,
-                    "keywords": extract_keywords(chunk),
-                })
-
-        except Exception as e:
+            stamp = _file_stamp(file_path)
+        except OSError as e:
+            # Deleted or unreadable since the directory scan
             console.print(f"[red]Error processing {file_path}: {e}[/red]")
+            continue
+        cached = previous.get(str(file_path.relative_to(PLAYBOOK_DIR)))
+        stamped.append((file_path, stamp, cached[1:] if cached and cached[0] == stamp else None))
+    reused = sum(1 for _, _, cached in stamped if cached is not None)
+
+    cpu_count = os.cpu_count() or 1
+    executor: Executor
+    if len(stamped) - reused >= PROCESS_POOL_MIN_FILES and cpu_count > 1:
+        max_workers = cpu_count
+        executor = ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        max_workers = min(32, cpu_count * 4)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    remaining = iter(stamped)
+    pending: deque[tuple[Path, list[int], Future]] = deque()
+
+    def submit(file_path: Path, stamp: list[int], cached: tuple[dict, list[dict]] | None) -> None:
+        if cached is not None:
+            future = Future()
+            future.set_result(cached)
+        else:
+            future = executor.submit(_process_file, file_path)
+        pending.append((file_path, stamp, future))
+
+    with executor:
+        for item in islice(remaining, max_workers * 2):
+            submit(*item)
+
+        # The live progress bar is only worth repainting on a terminal
+        progress = range(len(stamped))
+        if console.is_terminal:
+            progress = track(progress, description="Indexing files...", update_period=0.25, console=console)
+
+        for _ in progress:
+            file_path, stamp, future = pending.popleft()
+            if (next_item := next(remaining, None)) is not None:
+                submit(*next_item)
+            try:
+                file_info, chunk_records = future.result()
+            except Exception as e:
+                console.print(f"[red]Error processing {file_path}: {e}[/red]")
+                continue
+            if stamps is not None:
+                stamps[file_info["path"]] = stamp
+            yield file_info, chunk_records
+
+    if reused:
+        console.print(f"[blue]Reused {reused} unchanged files from the previous index[/blue]")
+
+
+def create_simple_index(
+    previous: dict[str, tuple[list[int], dict, list[dict]]] | None = None,
+    stamps: dict[str, list[int]] | None = None,
+) -> dict:
+    """
+    Create a simple keyword-based index (no embeddings).
+
+    Args:
+        previous: Records to reuse for unchanged files (see iter_processed_files)
+        stamps: If given, filled with the stamp of every indexed file
+
+    Returns:
+        Index dictionary with file paths and content chunks
+    """
+    index = {"files": [], "chunks": []}
+
+    for file_info, chunk_records in iter_processed_files(previous, stamps):
+        index["files"].append(file_info)
+        index["chunks"].extend(chunk_records)
 
     return index
 
 
+def write_binary_index(
+    previous: dict[str, tuple[list[int], dict, list[dict]]] | None = None,
+    stamps: dict[str, list[int]] | None = None,
+) -> tuple[int, int]:
+    """
+    Build the index straight into the binary index file.
+
+    Records are written as each file is processed, so the whole index is
+    never held in memory. Output goes to a temporary file that replaces the
+    index only once it is complete. `previous` and `stamps` are passed to
+    iter_processed_files.
+
+    Returns:
+        (files indexed, chunks written)
+    """
+    tmp_file = BINARY_INDEX_FILE.with_suffix(".bin.tmp")
+    file_count = 0
+    chunk_count = 0
+
+    with open(tmp_file, "wb") as f:
+        writer = BinaryIndexWriter(f)
+        for file_info, chunk_records in iter_processed_files(previous, stamps):
+            writer.add_file(file_info["path"], file_info["title"], file_info["size"])
+            for chunk in chunk_records:
+                writer.add_chunk(chunk["file"], chunk["chunk_id"], chunk["content"], chunk["keywords"])
+            file_count += 1
+            chunk_count += len(chunk_records)
+
+    os.replace(tmp_file, BINARY_INDEX_FILE)
+    INDEX_FILE.unlink(missing_ok=True)
+    return file_count, chunk_count
+
+
 def extract_title(content: str) -> str:
     """Extract the first heading as title."""
-    for line in content.split("\n"):
-        if line.startswith("# "):
-            return line[2:].strip()
-    return "Untitled"
+    # Cache on the scanned head only, so whole files are not kept alive
+    return _title_of_head(content[:_TITLE_SCAN_LIMIT])
+
+
+@lru_cache(maxsize=_EXTRACT_CACHE_SIZE)
+def _title_of_head(head: str) -> str:
+    match = _TITLE_RE.search(head)
+    return match.group(1).strip() if match else "Untitled"
 
 
 def extract_keywords(text: str) -> list[str]:
     """Extract simple keywords from text."""
-    # Simple keyword extraction - just lowercase words
-    words = text.lower().split()
-    # Filter short words and common words
-    stop_words = {"the", "a", "an", "is", "are", "was", "were", "be", "been", "being",
-                  "have", "has", "had", "do", "does", "did", "will", "would", "could",
-                  "should", "may", "might", "must", "shall", "can", "to", "of", "in",
-                  "for", "on", "with", "at", "by", "from", "as", "into", "through",
-                  "during", "before", "after", "above", "below", "between", "under",
-                  "again", "further", "then", "once", "here", "there", "when", "where",
-                  "why", "how", "all", "each", "few", "more", "most", "other", "some",
-                  "such", "no", "nor", "not", "only", "own", "same", "so", "than",
-                  "too", "very", "just", "and", "but", "if", "or", "because", "until",
-                  "while", "this", "that", "these", "those", "it", "its"}
-
-    keywords = []
-    for word in words:
-        # Clean the word
-        clean = "".join(c for c in word if c.isalnum())
-        if len(clean) > 3 and clean not in stop_words:
-            keywords.append(clean)
-
-    # Return unique keywords, limited to top 20
-    return list(dict.fromkeys(keywords))[:20]
-
-
-def save_index(index: dict) -> None:
-    """Save the index to a JSON file."""
-    INDEX_FILE.write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return list(_keywords_of(text))
+
+
+@lru_cache(maxsize=_EXTRACT_CACHE_SIZE)
+def _keywords_of(text: str) -> tuple[str, ...]:
+    # Cached as a tuple so callers can't mutate a shared result.
+    # Words are scanned lazily so the scan stops once 20 keywords are found;
+    # punctuation is stripped only from words that contain any
+    seen: set[str] = set()
+    keywords: list[str] = []
+    for match in _WORD_RE.finditer(text.lower()):
+        word = match.group()
+        if not word.isalnum():
+            word = _PUNCT_RE.sub("", word)
+        if len(word) > 3 and word not in _STOP_WORDS and word not in seen:
+            seen.add(word)
+            keywords.append(word)
+            if len(keywords) == 20:
+                break
+
+    return tuple(keywords)
+
+
+def save_index(index: dict, fmt: str = "binary", pretty: bool = False) -> None:
+    """Save the index in the binary format (default) or as JSON.
+
+    Only one index file is kept: writing one format removes the other, so
+    load_index never picks up a stale copy. JSON is written compact unless
+    `pretty` is set; orjson is used when installed.
+    """
+    if fmt == "binary":
+        serialize_binary(index, BINARY_INDEX_FILE)
+        INDEX_FILE.unlink(missing_ok=True)
+        console.print(f"[green]Index saved to {BINARY_INDEX_FILE}[/green]")
+        return
+
+    BINARY_INDEX_FILE.unlink(missing_ok=True)
+    data = intern_index(index)
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        INDEX_FILE.write_bytes(orjson.dumps(data, option=option))
+    else:
+        text = json.dumps(data, indent=2) if pretty else json.dumps(data, separators=(",", ":"))
+        INDEX_FILE.write_text(text, encoding="utf-8")
     console.print(f"[green]Index saved to {INDEX_FILE}[/green]")
 
 
@@ -150,6 +432,12 @@ def main() -> None:
     """Main entry point."""
     parser = argparse.ArgumentParser(description="Index the AI Project Playbook")
     parser.add_argument("--supabase", action="store_true", help="Store in Supabase (future)")
+    parser.add_argument(
+        "--format", choices=["binary", "json"], default="binary",
+        help="Index file format (default: binary)",
+    )
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON index for reading")
+    parser.add_argument("--full", action="store_true", help="Re-read every file instead of reusing unchanged ones")
     args = parser.parse_args()
 
     console.print("[bold blue]AI Project Playbook Indexer[/bold blue]")
@@ -158,14 +446,24 @@ def main() -> None:
     if args.supabase:
         console.print("[yellow]Supabase storage not yet implemented. Using local index.[/yellow]")
 
-    # Create and save index
-    index = create_simple_index()
+    # Create and save index (the binary index is streamed to disk as it is built)
+    previous = {} if args.full else load_previous_index()
+    stamps: dict[str, list[int]] = {}
+    if args.format == "binary":
+        file_count, chunk_count = write_binary_index(previous, stamps)
+    else:
+        index = create_simple_index(previous, stamps)
+        file_count, chunk_count = len(index["files"]), len(index["chunks"])
 
     console.print()
-    console.print(f"[green]Indexed {len(index['files'])} files[/green]")
-    console.print(f"[green]Created {len(index['chunks'])} chunks[/green]")
-
-    save_index(index)
+    console.print(f"[green]Indexed {file_count} files[/green]")
+    console.print(f"[green]Created {chunk_count} chunks[/green]")
+
+    if args.format == "binary":
+        console.print(f"[green]Index saved to {BINARY_INDEX_FILE}[/green]")
+    else:
+        save_index(index, fmt="json", pretty=args.pretty)
+    save_index_meta(stamps)
 
     console.print()
     console.print("[bold green]Indexing complete![/bold green]")
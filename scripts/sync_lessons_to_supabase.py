@@ -5,21 +5,146 @@ Usage:
     .venv/Scripts/python.exe scripts/sync_lessons_to_supabase.py
 
 This script reads all lessons from data/lessons.json and syncs them
-to the Supabase lessons_learned table, deduplicating by title.
+to the Supabase lessons_learned table. Lessons whose title already exists
+for the team are skipped by Postgres (requires the
+007_unique_lesson_title_per_team.sql migration).
+
+Batches are posted straight to PostgREST with httpx, several at a time
+(SYNC_CONCURRENCY), over HTTP/2 when the h2 package is installed.
 """
 
+import asyncio
 import json
 import os
 import sys
+from itertools import islice
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+import httpx
 from dotenv import load_dotenv
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import h2  # noqa: F401 -- enables httpx HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Rows per PostgREST insert request
+INSERT_BATCH_SIZE = 500
+# Batch requests in flight at once
+SYNC_CONCURRENCY = int(os.getenv("SYNC_CONCURRENCY", "8"))
+# Unique index from 007_unique_lesson_title_per_team.sql
+TITLE_CONFLICT_TARGET = "team_id,title_norm"
+# Lessons below this confidence are noise and are not synced
+MIN_CONFIDENCE = 0.4
+# lessons.json files larger than this are streamed with ijson when installed
+STREAM_THRESHOLD_BYTES = 10 * 1024 * 1024
+
+
+def _chunked(items: list[dict], size: int):
+    """Yield successive lists of at most `size` items."""
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _iter_local_lessons(lessons_file: Path):
+    """Yield lessons from lessons.json, streaming large files when possible."""
+    if ijson is not None and lessons_file.stat().st_size > STREAM_THRESHOLD_BYTES:
+        with open(lessons_file, "rb") as f:
+            # use_float keeps numbers JSON-serializable for the insert payload
+            yield from ijson.items(f, "lessons.item", use_float=True)
+        return
+
+    data = json.loads(lessons_file.read_text(encoding="utf-8"))
+    yield from data.get("lessons", [])
+
+
+def _to_row(team_id: str, lesson: dict, title: str) -> dict:
+    """Build a lessons_learned row from a local lesson."""
+    return {
+        "team_id": team_id,
+        "category": lesson.get("category", "workflow"),
+        "title": title,
+        "description": lesson.get("description", ""),
+        "context": lesson.get("context", ""),
+        "recommendation": lesson.get("recommendation", ""),
+        "project_types": lesson.get("project_types", []),
+        "tech_stacks": lesson.get("tech_stacks", []),
+        "tags": lesson.get("tags", []),
+        "confidence": lesson.get("confidence", 0.5),
+        "frequency": lesson.get("frequency", 1),
+        "contributed_by": "migration-sync",
+    }
 
-def migrate() -> None:
+
+async def _post_rows(client: httpx.AsyncClient, rows: list[dict]) -> int:
+    """
+    Insert rows, letting Postgres drop titles the team already has.
+
+    Returns:
+        Number of rows actually inserted
+    """
+    response = await client.post(
+        "/rest/v1/lessons_learned",
+        params={"on_conflict": TITLE_CONFLICT_TARGET, "select": "id"},
+        json=rows,
+    )
+    response.raise_for_status()
+    return len(response.json())
+
+
+async def _insert_batch(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, rows: list[dict]
+) -> tuple[int, int]:
+    """
+    Insert rows in one request, retrying row by row if the batch fails.
+
+    A single bad row rejects the whole array insert, so the fallback keeps
+    the rest of the batch from being lost. Duplicate titles are neither
+    inserted nor failed; only the rows Postgres returns count as inserted.
+
+    Returns:
+        (rows inserted, rows failed)
+    """
+    async with semaphore:
+        try:
+            return await _post_rows(client, rows), 0
+        except httpx.HTTPError as e:
+            print(f"  Batch insert failed ({e}), retrying {len(rows)} rows individually...")
+
+        inserted = 0
+        failed = 0
+        for row in rows:
+            try:
+                inserted += await _post_rows(client, [row])
+            except httpx.HTTPError as row_error:
+                failed += 1
+                print(f"  Error syncing '{row['title']}': {row_error}")
+        return inserted, failed
+
+
+async def _count_team_lessons(client: httpx.AsyncClient, team_id: str) -> int:
+    """Count the team's lessons with a HEAD request (no rows transferred)."""
+    response = await client.head(
+        "/rest/v1/lessons_learned",
+        params={"select": "id", "team_id": f"eq.{team_id}"},
+        headers={"Prefer": "count=exact"},
+    )
+    response.raise_for_status()
+    # Content-Range: "0-24/25", or "*/0" when empty
+    return int(response.headers.get("content-range", "*/0").rsplit("/", 1)[1])
+
+
+async def migrate() -> None:
     """Sync local lessons to Supabase."""
     load_dotenv()
 
@@ -32,84 +157,59 @@ def migrate() -> None:
         print("Set these in your .env file")
         sys.exit(1)
 
-    # Initialize Supabase client
-    from supabase import create_client
-
-    client = create_client(supabase_url, supabase_key)
-
     # Load local lessons
     lessons_file = Path(__file__).parent.parent / "data" / "lessons.json"
     if not lessons_file.exists():
         print(f"Error: {lessons_file} not found")
         sys.exit(1)
 
-    data = json.loads(lessons_file.read_text(encoding="utf-8"))
-    local_lessons = data.get("lessons", [])
-    print(f"Found {len(local_lessons)} local lessons")
-
-    # Get existing Supabase lessons for dedup
-    existing_result = (
-        client.table("lessons_learned")
-        .select("title")
-        .eq("team_id", team_id)
-        .execute()
-    )
-    existing_titles = {
-        row["title"].lower().strip() for row in (existing_result.data or [])
+    # Titles are stripped once here; case-insensitive dedup happens in Postgres
+    titled = [
+        (lesson, title)
+        for lesson in _iter_local_lessons(lessons_file)
+        if (title := lesson.get("title", "").strip())
+    ]
+    print(f"Found {len(titled)} local lessons")
+
+    # Skip very low confidence (noise)
+    rows = [
+        _to_row(team_id, lesson, title)
+        for lesson, title in titled
+        if lesson.get("confidence", 0.5) >= MIN_CONFIDENCE
+    ]
+    skipped = len(titled) - len(rows)
+
+    # Sync: batches run concurrently, at most SYNC_CONCURRENCY at a time
+    headers = {
+        "apikey": supabase_key,
+        "Authorization": f"Bearer {supabase_key}",
+        "Prefer": "resolution=ignore-duplicates,return=representation",
     }
-    print(f"Found {len(existing_titles)} existing Supabase lessons")
-
-    # Sync
-    synced = 0
-    skipped = 0
-    errors = 0
-
-    for lesson in local_lessons:
-        title = lesson.get("title", "").strip()
-        if not title:
-            continue
-
-        # Skip if already exists
-        if title.lower().strip() in existing_titles:
-            skipped += 1
-            continue
-
-        # Skip very low confidence (noise)
-        confidence = lesson.get("confidence", 0.5)
-        if confidence < 0.4:
-            skipped += 1
-            continue
-
-        try:
-            insert_data = {
-                "team_id": team_id,
-                "category": lesson.get("category", "workflow"),
-                "title": title,
-                "description": lesson.get("description", ""),
-                "context": lesson.get("context", ""),
-                "recommendation": lesson.get("recommendation", ""),
-                "project_types": lesson.get("project_types", []),
-                "tech_stacks": lesson.get("tech_stacks", []),
-                "tags": lesson.get("tags", []),
-                "confidence": confidence,
-                "frequency": lesson.get("frequency", 1),
-                "contributed_by": "migration-sync",
-            }
-
-            client.table("lessons_learned").insert(insert_data).execute()
-            synced += 1
-            existing_titles.add(title.lower().strip())  # Prevent self-duplication
-
-        except Exception as e:
-            errors += 1
-            print(f"  Error syncing '{title}': {e}")
+    semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
+    async with httpx.AsyncClient(
+        base_url=supabase_url.rstrip("/"),
+        headers=headers,
+        http2=HTTP2_AVAILABLE,
+        timeout=30.0,
+    ) as client:
+        results = await asyncio.gather(*(
+            _insert_batch(client, semaphore, batch)
+            for batch in _chunked(rows, INSERT_BATCH_SIZE)
+        ))
+        total = await _count_team_lessons(client, team_id)
+
+    synced = sum(inserted for inserted, _ in results)
+    errors = sum(failed for _, failed in results)
+
+    # Rows that were sent but neither inserted nor failed were duplicates
+    duplicates = len(rows) - synced - errors
 
     print(f"\nDone!")
     print(f"  Synced:  {synced}")
-    print(f"  Skipped: {skipped} (duplicates or low confidence)")
+    print(f"  Skipped: {skipped + duplicates} ({duplicates} duplicates, {skipped} low confidence)")
     print(f"  Errors:  {errors}")
-    print(f"  Total in Supabase: {len(existing_titles) + synced - errors}")
+    print(f"  Total in Supabase: {total}")
 
 
 if __name__ == "__main__":
-    migrate()
+    asyncio.run(migrate())
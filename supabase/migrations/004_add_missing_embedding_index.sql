@@ -0,0 +1,12 @@
+-- Migration: Partial index for lessons without embeddings
+-- Run this in Supabase SQL Editor
+-- Prerequisite: 003_add_lesson_embeddings.sql
+
+-- Lets scripts/backfill_embeddings.py fetch only rows that still need an
+-- embedding (team_id = ? AND embedding IS NULL) without scanning the table
+CREATE INDEX IF NOT EXISTS idx_lessons_missing_embedding
+ON lessons_learned(team_id)
+WHERE embedding IS NULL;
+
+-- Documentation
+COMMENT ON INDEX idx_lessons_missing_embedding IS 'Partial index of lessons still missing a semantic embedding';
@@ -0,0 +1,73 @@
+-- Migration: Binary-quantized search path for lesson embeddings
+-- Run this in Supabase SQL Editor
+-- Prerequisite: 003_add_lesson_embeddings.sql, pgvector >= 0.7.0
+
+-- Step 1: HNSW index over 1-bit quantized embeddings
+-- 512 dims -> 64 bytes per row instead of 2 KB of float32, compared with Hamming distance
+CREATE INDEX IF NOT EXISTS idx_lessons_embedding_binary
+ON lessons_learned USING hnsw ((binary_quantize(embedding)::bit(512)) bit_hamming_ops);
+
+-- Step 2: RPC function — coarse search on quantized vectors, exact cosine rerank
+-- Same result shape as match_lessons; rerank_factor controls how many
+-- quantized candidates (match_count * rerank_factor) are rescored at full precision.
+-- ef_search must stay >= the candidate count or the HNSW scan truncates it.
+CREATE OR REPLACE FUNCTION match_lessons_quantized(
+    query_embedding vector(512),
+    match_team_id UUID,
+    match_threshold FLOAT DEFAULT 0.3,
+    match_count INT DEFAULT 15,
+    rerank_factor INT DEFAULT 4
+)
+RETURNS TABLE (
+    id UUID,
+    category TEXT,
+    title TEXT,
+    description TEXT,
+    context TEXT,
+    recommendation TEXT,
+    confidence FLOAT,
+    frequency INTEGER,
+    project_types TEXT[],
+    tech_stacks TEXT[],
+    tags TEXT[],
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+SET hnsw.ef_search = 100
+AS $$
+BEGIN
+    RETURN QUERY
+    WITH candidates AS (
+        SELECT
+            l.id AS lesson_id,
+            l.embedding AS lesson_embedding
+        FROM lessons_learned l
+        WHERE l.team_id = match_team_id
+          AND l.embedding IS NOT NULL
+        ORDER BY binary_quantize(l.embedding)::bit(512) <~> binary_quantize(query_embedding)
+        LIMIT match_count * rerank_factor
+    )
+    SELECT
+        l.id,
+        l.category,
+        l.title,
+        l.description,
+        l.context,
+        l.recommendation,
+        l.confidence::FLOAT,
+        l.frequency,
+        l.project_types,
+        l.tech_stacks,
+        l.tags,
+        (1 - (c.lesson_embedding <=> query_embedding))::FLOAT AS similarity
+    FROM candidates c
+    JOIN lessons_learned l ON l.id = c.lesson_id
+    WHERE 1 - (c.lesson_embedding <=> query_embedding) > match_threshold
+    ORDER BY c.lesson_embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- Documentation
+COMMENT ON INDEX idx_lessons_embedding_binary IS 'HNSW index over binary-quantized lesson embeddings (Hamming distance)';
+COMMENT ON FUNCTION match_lessons_quantized IS 'Semantic lesson search: quantized candidate scan, full-precision cosine rerank';
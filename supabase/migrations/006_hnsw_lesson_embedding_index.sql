@@ -0,0 +1,74 @@
+-- Migration: HNSW index for lesson embeddings + similarity-ordered lesson listing
+-- Run this in Supabase SQL Editor
+-- Prerequisite: 003_add_lesson_embeddings.sql, pgvector >= 0.5.0
+
+-- Step 1: Replace the IVFFlat index with HNSW
+-- HNSW needs no lists tuning as the table grows and keeps recall high at small N
+DROP INDEX IF EXISTS idx_lessons_embedding;
+CREATE INDEX IF NOT EXISTS idx_lessons_embedding_hnsw
+ON lessons_learned USING hnsw (embedding vector_cosine_ops)
+WITH (m = 16, ef_construction = 64);
+
+-- Step 2: RPC function — team lessons ranked by cosine distance to a query
+-- Same filters as SupabaseClient.get_lessons; the embedding column is not returned
+CREATE OR REPLACE FUNCTION select_lessons_by_similarity(
+    query_embedding vector(512),
+    match_team_id UUID,
+    match_count INT DEFAULT 10,
+    filter_category TEXT DEFAULT NULL,
+    filter_project_type TEXT DEFAULT NULL,
+    filter_tech_stacks TEXT[] DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    category TEXT,
+    title TEXT,
+    description TEXT,
+    context TEXT,
+    recommendation TEXT,
+    confidence FLOAT,
+    frequency INTEGER,
+    upvotes INTEGER,
+    downvotes INTEGER,
+    project_types TEXT[],
+    tech_stacks TEXT[],
+    tags TEXT[],
+    contributed_by TEXT,
+    created_at TIMESTAMPTZ,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        l.id,
+        l.category,
+        l.title,
+        l.description,
+        l.context,
+        l.recommendation,
+        l.confidence::FLOAT,
+        l.frequency,
+        l.upvotes,
+        l.downvotes,
+        l.project_types,
+        l.tech_stacks,
+        l.tags,
+        l.contributed_by,
+        l.created_at,
+        (1 - (l.embedding <=> query_embedding))::FLOAT AS similarity
+    FROM lessons_learned l
+    WHERE l.team_id = match_team_id
+      AND l.embedding IS NOT NULL
+      AND (filter_category IS NULL OR l.category = filter_category)
+      AND (filter_project_type IS NULL OR l.project_types @> ARRAY[filter_project_type])
+      AND (filter_tech_stacks IS NULL OR l.tech_stacks && filter_tech_stacks)
+    ORDER BY l.embedding <=> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- Documentation
+COMMENT ON INDEX idx_lessons_embedding_hnsw IS 'HNSW index for cosine similarity search over lesson embeddings';
+COMMENT ON FUNCTION select_lessons_by_similarity IS 'Team lessons ordered by semantic similarity, with get_lessons filters';
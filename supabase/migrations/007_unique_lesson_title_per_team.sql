@@ -0,0 +1,69 @@
+-- Migration: Enforce one lesson per normalized title per team
+-- Run this in Supabase SQL Editor
+-- Prerequisite: schema.sql (lessons_learned table)
+--
+-- WARNING: Step 2 permanently deletes duplicate lessons (same team, same
+-- title ignoring case and surrounding whitespace). The oldest row of each group
+-- is kept; frequency, upvotes and downvotes of the removed rows are added to
+-- it first, and its confidence becomes the group's highest. Everything else
+-- on the removed rows (description, recommendation, tags, embedding) is lost.
+-- Review the duplicates first with:
+--   SELECT team_id, lower(btrim(title, E' \t\r\n')), count(*) FROM lessons_learned
+--   GROUP BY 1, 2 HAVING count(*) > 1;
+
+-- Step 1: Normalized title column, maintained by Postgres
+-- btrim() alone strips only spaces; the explicit set also strips tabs and
+-- line breaks, matching normalize_lesson_title() in agent/supabase_client.py
+ALTER TABLE lessons_learned
+ADD COLUMN IF NOT EXISTS title_norm TEXT
+GENERATED ALWAYS AS (lower(btrim(title, E' \t\r\n'))) STORED;
+
+-- Step 2: Fold duplicates into the oldest row of each group, then delete them
+-- Rows without a team are left alone (NULL team_ids never conflict)
+CREATE TEMP TABLE lesson_duplicates AS
+SELECT id, keep_id
+FROM (
+    SELECT
+        id,
+        first_value(id) OVER (
+            PARTITION BY team_id, title_norm
+            ORDER BY created_at NULLS LAST, id
+        ) AS keep_id
+    FROM lessons_learned
+    WHERE team_id IS NOT NULL
+) ranked
+WHERE id <> keep_id;
+
+UPDATE lessons_learned l
+SET frequency = COALESCE(l.frequency, 1) + t.frequency,
+    upvotes = COALESCE(l.upvotes, 0) + t.upvotes,
+    downvotes = COALESCE(l.downvotes, 0) + t.downvotes,
+    confidence = GREATEST(l.confidence, t.confidence),
+    updated_at = NOW()
+FROM (
+    SELECT
+        d.keep_id,
+        SUM(COALESCE(dup.frequency, 1)) AS frequency,
+        SUM(COALESCE(dup.upvotes, 0)) AS upvotes,
+        SUM(COALESCE(dup.downvotes, 0)) AS downvotes,
+        MAX(dup.confidence) AS confidence
+    FROM lesson_duplicates d
+    JOIN lessons_learned dup ON dup.id = d.id
+    GROUP BY d.keep_id
+) t
+WHERE l.id = t.keep_id;
+
+DELETE FROM lessons_learned
+WHERE id IN (SELECT id FROM lesson_duplicates);
+
+DROP TABLE lesson_duplicates;
+
+-- Step 3: Unique index used as the upsert conflict target
+-- scripts/sync_lessons_to_supabase.py upserts with
+-- on_conflict="team_id,title_norm" and ignore_duplicates, so dedup happens here
+CREATE UNIQUE INDEX IF NOT EXISTS idx_lessons_team_title_norm
+ON lessons_learned (team_id, title_norm);
+
+-- Documentation
+COMMENT ON COLUMN lessons_learned.title_norm IS 'lower(btrim(title, E'' \t\r\n'')); generated, used for per-team title dedup';
+COMMENT ON INDEX idx_lessons_team_title_norm IS 'One lesson per normalized title per team (upsert conflict target)';